@@ -0,0 +1,146 @@
+"""
+Benchmark dos pipelines do bi-dashboard contra servidores locais (sem rede).
+
+Sobe stand-ins de DummyJSON, Rows.com e Notion (stub_servers.py) e executa
+cada pipeline em um processo separado, reportando:
+  - throughput (produtos extraídos por segundo)
+  - p50/p99 da duração de cada execução
+  - p50/p99 da latência por requisição vista pelos servidores
+  - pico de memória (RSS) do processo do pipeline
+
+Uso (a partir de bi-dashboard/):
+  python benchmarks/bench_pipeline.py --catalog-size 100000 --latency-ms 20 --error-rate 0.01
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCH_DIR, "..", "src")
+
+# nome no relatório -> comando da CLI (main.COMMANDS)
+PIPELINES = {
+    "run_report": "report",
+    "run_export": "excel",
+    "run_rows_sync": "rows-sync",
+    "run_streaming_export": "excel-stream",
+    "run_streaming_rows_sync": "rows-stream",
+}
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return float("nan")
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta em KB, macOS em bytes
+    return rss / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def run_child(command: str, repeat: int) -> int:
+    """Executado no processo filho: roda o pipeline N vezes e imprime JSON"""
+    import contextlib
+    import io
+    sys.path.insert(0, SRC_DIR)
+    import main
+
+    app = main.App()
+    action = app.resolve(command)
+    durations, ok = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            ok += bool(action())
+        durations.append(time.perf_counter() - start)
+    app.close()
+
+    print(json.dumps({"durations": durations, "ok": ok, "peak_rss_mb": peak_rss_mb()}))
+    return 0
+
+
+def run_parent(args) -> int:
+    sys.path.insert(0, BENCH_DIR)
+    from stub_servers import start_stub_servers, stub_env
+
+    servers = start_stub_servers(args.latency_ms, args.error_rate, args.catalog_size)
+    selected = args.pipelines.split(",") if args.pipelines else list(PIPELINES)
+
+    print(f"Catálogo: {args.catalog_size} | latência: {args.latency_ms}ms | erros: {args.error_rate:.1%} | "
+          f"repetições: {args.repeat} | cache de artefatos: {'ligado' if args.artifact_cache else 'desligado'}")
+    print(f"{'PIPELINE':<24} | {'OK':>5} | {'PROD/S':>9} | {'P50 (s)':>8} | {'P99 (s)':>8} | "
+          f"{'REQ P50':>8} | {'REQ P99':>8} | {'REQS':>6} | {'RSS (MB)':>8}")
+    print("-" * 108)
+
+    try:
+        for name in selected:
+            with tempfile.TemporaryDirectory() as workdir:
+                env = dict(os.environ, **stub_env(servers))
+                # Tudo que o pipeline grava fica no diretório temporário, nunca em src/output
+                env.update({
+                    "caminho_fatec": workdir, "ROWS_STATE_DIR": workdir,
+                    "BI_SNAPSHOT_DB": os.path.join(workdir, "bi_snapshots.db"),
+                    "BI_ARTIFACT_DIR": os.path.join(workdir, "artifacts"),
+                    "BI_ARTIFACT_CACHE": "1" if args.artifact_cache else "0",
+                    "PRODUCT_CACHE_TTL": "300" if args.warm_cache else "0",
+                    "NOTION_MIN_INTERVAL": "0",
+                })
+                before = {k: s.stats.snapshot() for k, s in servers.items()}
+                result = subprocess.run(
+                    [sys.executable, __file__, "--child", PIPELINES[name], "--repeat", str(args.repeat)],
+                    cwd=SRC_DIR, env=env, capture_output=True, text=True,
+                )
+                if result.returncode != 0:
+                    print(f"{name:<24} | falhou: {result.stderr.strip().splitlines()[-1:]}")
+                    continue
+                after = {k: s.stats.snapshot() for k, s in servers.items()}
+
+            data = json.loads(result.stdout.strip().splitlines()[-1])
+            durations = data["durations"]
+            products = after["dummyjson"]["products_served"] - before["dummyjson"]["products_served"]
+            latencies = [lat for k in servers for lat in after[k]["latencies_ms"][len(before[k]["latencies_ms"]):]]
+            requests_made = sum(after[k]["requests"] - before[k]["requests"] for k in servers)
+            throughput = products / sum(durations) if sum(durations) else 0.0
+
+            print(f"{name:<24} | {data['ok']:>2}/{args.repeat:<2} | {throughput:>9.0f} | "
+                  f"{percentile(durations, 50):>8.3f} | {percentile(durations, 99):>8.3f} | "
+                  f"{percentile(latencies, 50):>6.1f}ms | {percentile(latencies, 99):>6.1f}ms | "
+                  f"{requests_made:>6} | {data['peak_rss_mb']:>8.1f}")
+    finally:
+        for server in servers.values():
+            server.stop()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark dos pipelines com servidores locais")
+    parser.add_argument("--catalog-size", type=int, default=1000, help="Produtos no DummyJSON local (1k a 1M)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Latência artificial por requisição")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fração de respostas 503 injetadas")
+    parser.add_argument("--repeat", type=int, default=5, help="Execuções por pipeline")
+    parser.add_argument("--pipelines", default="", help=f"Subconjunto separado por vírgula: {', '.join(PIPELINES)}")
+    parser.add_argument("--warm-cache", action="store_true", help="Mantém o cache de páginas entre repetições")
+    parser.add_argument("--artifact-cache", action="store_true",
+                        help="Reaproveita artefatos entre repetições (mede execuções com cache)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return run_child(args.child, args.repeat)
+    return run_parent(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Benchmark da desserialização de produtos do DummyJSON.
+
+Compara, para 1k/10k/100k itens:
+  - legado: response.json() + ProductDTO(**item) por item
+  - bulk:   validate_json do corpo bruto com TypeAdapter em cache
+
+Uso (a partir de bi-dashboard/):  python benchmarks/bench_product_decode.py
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from models.product_dto import ProductDTO  # noqa: E402
+from controllers.dummy_json_controller import DummyJsonController  # noqa: E402
+
+SIZES = (1_000, 10_000, 100_000)
+REPEAT = 3
+
+
+def build_body(n: int) -> bytes:
+    # Itens no formato real da API, com os campos extras que o DTO ignora
+    products = [{
+        "id": i,
+        "title": f"Produto de teste número {i}",
+        "description": "Descrição longa do produto para simular o payload real.",
+        "category": "beauty",
+        "price": 9.99 + i % 100,
+        "discountPercentage": 7.17,
+        "rating": 4.94,
+        "stock": i % 50,
+        "tags": ["beauty", "mascara"],
+        "brand": "Essence" if i % 3 else None,
+        "sku": f"SKU-{i}",
+        "images": ["https://cdn.dummyjson.com/img.png"],
+    } for i in range(n)]
+    return json.dumps({"products": products, "total": n, "skip": 0, "limit": n}).encode("utf-8")
+
+
+def legacy_decode(body: bytes):
+    data = json.loads(body)
+    return [ProductDTO(**item) for item in data.get("products", [])]
+
+
+def best_of(fn, body: bytes) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn(body)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    bulk = DummyJsonController(session=object())
+
+    print(f"{'ITENS':>8} | {'LEGADO (s)':>11} | {'BULK (s)':>9} | {'GANHO':>7}")
+    print("-" * 45)
+    for n in SIZES:
+        body = build_body(n)
+        t_legacy = best_of(legacy_decode, body)
+        t_bulk = best_of(bulk.decode_products, body)
+        print(f"{n:>8} | {t_legacy:>11.4f} | {t_bulk:>9.4f} | {t_legacy / t_bulk:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
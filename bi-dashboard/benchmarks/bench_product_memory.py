@@ -0,0 +1,65 @@
+"""
+Benchmark de memória dos produtos limpos.
+
+Compara, para 10k/100k itens, os bytes alocados (tracemalloc) por produto:
+  - linhas:   List[CleanedProductDTO] do DataService
+  - colunas:  ProductColumns do ColumnarDataService (arrays tipados,
+              categoria/marca/status codificados, título curto sob demanda)
+  - buffers:  ProductColumns.nbytes, só os dados (o resto é overhead dos objetos)
+
+Uso (a partir de bi-dashboard/):  python benchmarks/bench_product_memory.py
+"""
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from models.product_dto import ProductDTO  # noqa: E402
+from services.data_service import DataService  # noqa: E402
+from services.columnar_data_service import ColumnarDataService  # noqa: E402
+
+SIZES = (10_000, 100_000)
+CATEGORIES = ["beauty", "fragrances", "furniture", "groceries", "laptops", "smartphones"]
+BRANDS = [f"Marca {i}" for i in range(40)]
+
+
+def build_records(n: int):
+    # Títulos únicos por item (como na API); categoria e marca se repetem
+    return [{
+        "id": i,
+        "title": f"Produto de teste número {i} - edição especial",
+        "category": CATEGORIES[i % len(CATEGORIES)],
+        "price": 9.99 + i % 100,
+        "stock": i % 50,
+        "brand": BRANDS[i % len(BRANDS)] if i % 3 else None,
+    } for i in range(n)]
+
+
+def allocated(build) -> int:
+    """Bytes que continuam alocados enquanto o resultado de build() está vivo"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def main():
+    print(f"{'ITENS':>8} | {'LINHAS (B/item)':>15} | {'COLUNAS (B/item)':>16} | {'BUFFERS (B/item)':>16} | {'REDUÇÃO':>8}")
+    print("-" * 77)
+    for n in SIZES:
+        records = build_records(n)
+        dtos = [ProductDTO(**r) for r in records]
+        rows = allocated(lambda: DataService().prepare_products(dtos)[0])
+        columns = allocated(lambda: ColumnarDataService().prepare_records(records)[0])
+        buffers = ColumnarDataService().prepare_records(records)[0].nbytes
+        print(f"{n:>8} | {rows / n:>15.1f} | {columns / n:>16.1f} | {buffers / n:>16.1f} | {rows / columns:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark de cold start do bi-dashboard (python -X importtime).
+
+Para cada comando da CLI, mede em um processo novo o tempo de import
+necessário para montar o comando (main.App().resolve(cmd)) e verifica que
+dependências pesadas não são carregadas por quem não precisa delas.
+A linha "todos" equivale ao antigo main.py, que importava tudo no início.
+
+Uso (a partir de bi-dashboard/):  python benchmarks/bench_startup.py
+Sai com código 1 se algum comando carregar um módulo proibido.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+REPEAT = 5
+
+# Módulos que cada comando NÃO pode carregar só para iniciar
+FORBIDDEN = {
+    "notion-ping": {"numpy", "pandas", "openpyxl", "pydantic", "pyarrow"},
+    "report": {"pandas", "openpyxl", "pyarrow"},
+    "excel": {"pandas", "pyarrow"},
+    "rows-sync": {"pandas", "openpyxl", "pyarrow"},
+}
+
+COMMANDS = ["notion-ping", "report", "excel", "rows-sync"]
+
+
+def measure(snippet: str, env: dict):
+    """Executa o snippet em um processo novo; retorna (import_us, wall_ms, módulos raiz)"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", snippet],
+        cwd=SRC_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules.add(name.strip().split(".")[0])
+        # Só os imports de nível 0 entram na soma (os aninhados já estão no cumulativo)
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    return total_us, wall_ms, modules
+
+
+def best_of(snippet: str, env: dict):
+    runs = [measure(snippet, env) for _ in range(REPEAT)]
+    return min(r[0] for r in runs), min(r[1] for r in runs), runs[0][2]
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as workdir:
+        # Montar os comandos já abre o banco de snapshots: nada é gravado em src/output
+        env = dict(os.environ, BI_SNAPSHOT_DB=os.path.join(workdir, "bi_snapshots.db"),
+                   BI_ARTIFACT_DIR=os.path.join(workdir, "artifacts"),
+                   caminho_fatec=workdir, ROWS_STATE_DIR=workdir)
+        return run(env)
+
+
+def run(env: dict) -> int:
+    eager = "import main; app = main.App(); [app.resolve(c) for c in main.COMMANDS]; import numpy"
+    falhas = 0
+
+    print(f"{'COMANDO':<12} | {'IMPORTS (ms)':>12} | {'PROCESSO (ms)':>13} | PESADOS CARREGADOS")
+    print("-" * 75)
+    for cmd in COMMANDS:
+        import_us, wall_ms, modules = best_of(f"import main; main.App().resolve({cmd!r})", env)
+        heavy = sorted(m for m in modules if m in {"numpy", "pandas", "openpyxl", "pydantic", "requests", "pyarrow"})
+        proibidos = FORBIDDEN.get(cmd, set()) & modules
+        flag = f"  ❌ proibidos: {', '.join(sorted(proibidos))}" if proibidos else ""
+        falhas += bool(proibidos)
+        print(f"{cmd:<12} | {import_us / 1000:>12.1f} | {wall_ms:>13.1f} | {', '.join(heavy) or '-'}{flag}")
+
+    import_us, wall_ms, _ = best_of(eager, env)
+    print(f"{'todos':<12} | {import_us / 1000:>12.1f} | {wall_ms:>13.1f} | (referência: import antecipado)")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
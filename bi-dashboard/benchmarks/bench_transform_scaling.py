@@ -0,0 +1,88 @@
+"""
+Benchmark de escalabilidade do tratamento (ColumnarDataService x ProcessPoolDataService).
+
+Trata um catálogo sintético (1 milhão de itens por padrão) em dois formatos:
+  - dtos:  páginas de ProductDTO já desserializadas (o processo principal
+           precisa reserializar cada bloco em JSON antes de enviar)
+  - bruto: corpos JSON da API, como em DummyJsonController.iter_raw_pages
+           (o processo principal não desserializa nada)
+
+Para cada formato mede o tratamento inline (ColumnarDataService em um
+único processo) e o pool com 2, 4, 8... workers até os núcleos da máquina.
+O pool é aquecido antes da medição, como no daemon.
+
+Uso (a partir de bi-dashboard/):  python benchmarks/bench_transform_scaling.py [itens]
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from models.products_response_dto import PRODUCT_LIST_ADAPTER  # noqa: E402
+from services.columnar_data_service import ColumnarDataService  # noqa: E402
+from services.metrics_accumulator import MetricsAccumulator  # noqa: E402
+from services.process_pool_data_service import ProcessPoolDataService  # noqa: E402
+from stub_servers import fake_product  # noqa: E402
+
+PAGE_SIZE = 10_000
+REPEAT = 2
+
+
+def best_of(fn) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def inline_raw(bodies):
+    accumulator = MetricsAccumulator()
+    for body in bodies:
+        columns, stats = ColumnarDataService().prepare_records(json.loads(body)["products"])
+        accumulator.add(columns, stats)
+
+
+def inline_dtos(pages):
+    accumulator = MetricsAccumulator()
+    for page in pages:
+        columns, stats = ColumnarDataService().prepare_products(page)
+        accumulator.add(columns, stats)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    records = [fake_product(i) for i in range(1, n + 1)]
+    chunks = [records[i:i + PAGE_SIZE] for i in range(0, n, PAGE_SIZE)]
+    inputs = {
+        "dtos": (inline_dtos, [PRODUCT_LIST_ADAPTER.validate_python(c) for c in chunks]),
+        "bruto": (inline_raw, [json.dumps({"products": c, "total": n}).encode("utf-8") for c in chunks]),
+    }
+    del records, chunks
+
+    cores = os.cpu_count() or 1
+    # Em máquina de 1 núcleo ainda mede 2 workers (mostra só o overhead)
+    counts = sorted({max(cores, 2)} | {w for w in (2, 4, 8, 16, 32) if w <= cores})
+
+    print(f"{n} itens | páginas de {PAGE_SIZE} | {cores} núcleo(s)")
+    print(f"{'FORMATO':<7} | {'MODO':<12} | {'TEMPO (s)':>9} | {'ITENS/s':>12} | {'GANHO':>6}")
+    print("-" * 60)
+    for name, (inline, pages) in inputs.items():
+        t_inline = best_of(lambda: inline(pages))
+        print(f"{name:<7} | {'inline':<12} | {t_inline:>9.3f} | {n / t_inline:>12,.0f} | {1.0:>5.1f}x")
+
+        for workers in counts:
+            service = ProcessPoolDataService(workers=workers)
+            service.pool.submit(int).result()
+            try:
+                elapsed = best_of(lambda: list(service.prepare_stream(pages, MetricsAccumulator())))
+            finally:
+                service.close()
+            print(f"{name:<7} | {f'{workers} workers':<12} | {elapsed:>9.3f} | {n / elapsed:>12,.0f} | {t_inline / elapsed:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
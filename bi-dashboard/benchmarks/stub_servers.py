@@ -0,0 +1,158 @@
+"""
+Servidores HTTP locais que imitam DummyJSON, Rows.com e Notion para os benchmarks.
+
+Cada servidor tem latência configurável e injeção de erros (503), e guarda
+estatísticas (requisições, bytes, latência por requisição) para o harness.
+O catálogo do DummyJSON é gerado sob demanda a partir do id: 1M de produtos
+não ocupa memória no servidor.
+"""
+import json
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+CATEGORIES = ["beauty", "fragrances", "furniture", "groceries", "laptops", "smartphones"]
+BRANDS = ["Essence", "Glamour Beauty", "Velvet Touch", None, "Chic Cosmetics"]
+
+
+class StubStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.products_served = 0
+        self.latencies_ms = []
+
+    def record(self, started: float, bytes_in: int, bytes_out: int, products: int = 0, error: bool = False):
+        with self._lock:
+            self.requests += 1
+            self.errors += error
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+            self.products_served += products
+            self.latencies_ms.append((time.perf_counter() - started) * 1000)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "products_served": self.products_served,
+                "latencies_ms": list(self.latencies_ms),
+            }
+
+
+def fake_product(product_id: int) -> dict:
+    rnd = random.Random(product_id)
+    return {
+        "id": product_id,
+        "title": f"Produto {product_id} " + "x" * rnd.randint(0, 30),
+        "description": "Produto gerado pelo servidor de benchmark.",
+        "category": CATEGORIES[product_id % len(CATEGORIES)],
+        "price": round(rnd.uniform(1, 2000), 2),
+        "discountPercentage": 10.5,
+        "rating": 4.5,
+        "stock": rnd.randint(0, 120),
+        "brand": BRANDS[product_id % len(BRANDS)],
+        "sku": f"SKU-{product_id}",
+    }
+
+
+def _make_handler(kind: str, stats: StubStats, latency_ms: float, error_rate: float, catalog_size: int):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, como as APIs reais
+
+        def setup(self):
+            super().setup()
+            # Cabeçalho e corpo saem em writes separados: sem TCP_NODELAY o
+            # Nagle + delayed ACK somam ~40ms artificiais por requisição
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, started: float, status: int, body: bytes, bytes_in: int, products: int = 0):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            stats.record(started, bytes_in, len(body), products, error=status >= 400)
+
+        def _handle(self):
+            started = time.perf_counter()
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                self.rfile.read(length)
+            if latency_ms:
+                time.sleep(latency_ms / 1000)
+            if error_rate and random.random() < error_rate:
+                return self._reply(started, 503, b'{"message": "injected error"}', length)
+
+            if kind == "dummyjson":
+                query = parse_qs(urlparse(self.path).query)
+                limit = int(query.get("limit", ["30"])[0])
+                skip = int(query.get("skip", ["0"])[0])
+                ids = range(skip, min(skip + limit, catalog_size))
+                body = json.dumps({
+                    "products": [fake_product(i) for i in ids],
+                    "total": catalog_size, "skip": skip, "limit": limit,
+                }).encode("utf-8")
+                return self._reply(started, 200, body, length, products=len(ids))
+
+            return self._reply(started, 200, b'{"ok": true}', length)
+
+        do_GET = _handle
+        do_POST = _handle
+        do_PATCH = _handle
+
+    return Handler
+
+
+class StubServer:
+    def __init__(self, kind: str, latency_ms: float = 0, error_rate: float = 0.0, catalog_size: int = 1000):
+        self.kind = kind
+        self.stats = StubStats()
+        handler = _make_handler(kind, self.stats, latency_ms, error_rate, catalog_size)
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self) -> "StubServer":
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def start_stub_servers(latency_ms: float = 0, error_rate: float = 0.0, catalog_size: int = 1000) -> dict:
+    """Sobe os três servidores e devolve {nome: StubServer}"""
+    return {
+        kind: StubServer(kind, latency_ms, error_rate, catalog_size).start()
+        for kind in ("dummyjson", "rows", "notion")
+    }
+
+
+def stub_env(servers: dict) -> dict:
+    """Variáveis de ambiente que apontam o bi-dashboard para os servidores locais"""
+    return {
+        "DUMMYJSON_BASE_URL": f"{servers['dummyjson'].url}/products",
+        "ROWS_API_BASE_URL": f"{servers['rows'].url}/v1",
+        "NOTION_API_BASE_URL": f"{servers['notion'].url}/v1",
+        "ROWS_API_KEY": "bench", "ROWS_SPREADSHEET_ID": "bench", "ROWS_TABLE_ID": "bench",
+        "NOTION_TOKEN": "bench", "NOTION_BLOCK_ID": "bench",
+    }
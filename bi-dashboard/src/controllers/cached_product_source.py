@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterator, Optional, Tuple
+import requests
+from models.product_page import ProductPage
+from models.products_response_dto import PRODUCT_LIST_ADAPTER
+from controllers.dummy_json_controller import DummyJsonController
+from controllers.pagination import PagedProductSource
+
+@dataclass
+class _CacheEntry:
+    page: ProductPage
+    stored_at: float
+
+
+class CachedProductSource(PagedProductSource):
+    """
+    Decorator de IProductSource com cache TTL + LRU por (limit, skip).
+    Camada opcional em disco (PRODUCT_CACHE_DIR) sobrevive entre execuções.
+    Entradas expiradas são revalidadas com ETag/Last-Modified: um 304 renova
+    o TTL sem baixar a página de novo.
+    """
+
+    def __init__(self, source: DummyJsonController, ttl_seconds: float = None,
+                 max_entries: int = None, disk_dir: str = None):
+        self.source = source
+        self.ttl = ttl_seconds if ttl_seconds is not None else float(os.getenv("PRODUCT_CACHE_TTL", "300"))
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv("PRODUCT_CACHE_SIZE", "128"))
+        self.disk_dir = disk_dir or os.getenv("PRODUCT_CACHE_DIR")
+        if self.disk_dir and not os.path.exists(self.disk_dir):
+            os.makedirs(self.disk_dir)
+
+        self._entries: "OrderedDict[Tuple[int, int], _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_concurrency(self) -> int:
+        return self.source.max_concurrency
+
+    def iter_raw_pages(self, page_size=1000) -> Iterator[bytes]:
+        # Catálogo bruto (motor em processos) não passa pelo cache: seria guardar tudo em memória
+        return self.source.iter_raw_pages(page_size)
+
+    def fetch_page(self, limit: int, skip: int) -> ProductPage:
+        key = (limit, skip)
+        entry = self._get_memory(key) or self._load_disk(key)
+
+        if entry and self._is_fresh(entry):
+            self.hits += 1
+            self._put_memory(key, entry)
+            return entry.page
+
+        # Expirado: revalida com os validadores que temos (se houver)
+        try:
+            page = self.source.fetch_page(limit, skip,
+                                          etag=entry.page.etag if entry else None,
+                                          last_modified=entry.page.last_modified if entry else None)
+        except requests.exceptions.RequestException:
+            if entry:
+                # Melhor servir um dado vencido do que nenhum dado
+                print(f"⚠️ API indisponível, usando cache expirado (limit={limit}, skip={skip})")
+                return entry.page
+            raise
+
+        if page.not_modified and entry:
+            # 304: mesma página, só o TTL é renovado
+            page = entry.page
+        else:
+            self.misses += 1
+
+        entry = _CacheEntry(page=page, stored_at=time.time())
+        self._put_memory(key, entry)
+        self._save_disk(key, entry)
+        return page
+
+    # --- Camada em memória (LRU) ---
+
+    def _is_fresh(self, entry: _CacheEntry) -> bool:
+        return (time.time() - entry.stored_at) < self.ttl
+
+    def _get_memory(self, key) -> Optional[_CacheEntry]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def _put_memory(self, key, entry: _CacheEntry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # --- Camada em disco (opcional) ---
+
+    def _disk_path(self, key) -> str:
+        limit, skip = key
+        return os.path.join(self.disk_dir, f"products_{limit}_{skip}.json")
+
+    def _load_disk(self, key) -> Optional[_CacheEntry]:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            page = ProductPage(
+                products=PRODUCT_LIST_ADAPTER.validate_python(data["products"]),
+                total=data["total"], skip=key[1], limit=key[0],
+                etag=data.get("etag"), last_modified=data.get("last_modified"),
+            )
+            return _CacheEntry(page=page, stored_at=data["stored_at"])
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Cache em disco ignorado ({path}): {e}")
+            return None
+
+    def _save_disk(self, key, entry: _CacheEntry):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        data = {
+            "products": [p.model_dump() for p in entry.page.products],
+            "total": entry.page.total,
+            "etag": entry.page.etag,
+            "last_modified": entry.page.last_modified,
+            "stored_at": entry.stored_at,
+        }
+        try:
+            # Escrita atômica: nunca deixa um JSON pela metade no disco
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Não foi possível gravar o cache em disco: {e}")
@@ -1,25 +1,76 @@
-from typing import List
+import os
+import re
+from typing import Iterator, List, Tuple
 import requests
 from models.product_dto import ProductDTO
-from interfaces.Iproduct_source import IProductSource
+from models.products_response_dto import PRODUCTS_RESPONSE_ADAPTER
+from models.product_page import ProductPage
+from controllers.pagination import PagedProductSource, iter_payloads
+from data.http_session import create_http_session
 
-class DummyJsonController(IProductSource):
+_TOTAL_PATTERN = re.compile(rb'"total"\s*:\s*(\d+)')
+
+class DummyJsonController(PagedProductSource):
     BASE_URL = "https://dummyjson.com/products"
 
-    def fetch_products(self, limit=10, skip=0) -> List[ProductDTO]:
+    def __init__(self, session: requests.Session = None, max_concurrency: int = None):
+        # Session compartilhada (pool keep-alive + timeout + retry)
+        self.session = session or create_http_session()
+        # DUMMYJSON_BASE_URL permite apontar para um servidor local (benchmarks)
+        self.base_url = os.getenv("DUMMYJSON_BASE_URL", self.BASE_URL)
+        # Páginas em voo ao mesmo tempo nos pipelines de catálogo completo
+        self.max_concurrency = max_concurrency if max_concurrency is not None else int(os.getenv("DUMMYJSON_MAX_CONCURRENCY", "8"))
+
+    def iter_raw_pages(self, page_size=1000) -> Iterator[bytes]:
+        """
+        Catálogo completo como corpos JSON brutos, sem desserializar: para os
+        motores colunares, que decodificam o JSON por conta própria.
+        Mesma busca em paralelo do iter_pages; erros de rede sobem como RequestException.
+        """
+        return iter_payloads(self._fetch_raw_page, page_size, self.max_concurrency)
+
+    def _fetch_raw_page(self, limit: int, skip: int) -> Tuple[bytes, int]:
+        response = self.session.get(self.base_url, params={"limit": limit, "skip": skip})
+        response.raise_for_status()
+        body = response.content
+        return body, self._envelope_total(body)
+
+    @staticmethod
+    def _envelope_total(body: bytes) -> int:
+        # "total" do envelope fica depois da lista: basta ler o fim do corpo
+        match = _TOTAL_PATTERN.search(body, max(0, body.rfind(b'"total"')))
+        return int(match.group(1)) if match else 0
+
+    def fetch_page(self, limit: int, skip: int, etag: str = None, last_modified: str = None) -> ProductPage:
+        """
+        Busca uma única página. Erros de rede sobem como RequestException.
+        Com etag/last_modified a requisição é condicional: um 304 devolve
+        uma página vazia marcada como not_modified.
+        """
         params = {"limit": limit, "skip": skip}
-        try:
-            response = requests.get(self.BASE_URL, params=params)
-            response.raise_for_status()
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
 
-            # O DummyJSON retorna um objeto: {"products": [...], "total": 100...}
-            data = response.json()
-            raw_list = data.get("products", [])
+        response = self.session.get(self.base_url, params=params, headers=headers)
+        if response.status_code == 304:
+            return ProductPage(products=[], total=0, skip=skip, limit=limit,
+                               etag=etag, last_modified=last_modified, not_modified=True)
+        response.raise_for_status()
 
-            # 2. Desserialização Manual (Transformando Dict em Objeto)
-            # Para cada dicionário na lista, criamos uma instância de ProductDTO
-            return [ProductDTO(**item) for item in raw_list]
+        products, total = self.decode_products(response.content)
+        return ProductPage(products=products, total=total, skip=skip, limit=limit,
+                           etag=response.headers.get("ETag"),
+                           last_modified=response.headers.get("Last-Modified"))
 
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Erro ao acessar API: {e}")
-            return []
\ No newline at end of file
+    def decode_products(self, body: bytes) -> Tuple[List[ProductDTO], int]:
+        """
+        Desserializa o corpo bruto da resposta em uma única passada.
+        O DummyJSON retorna um objeto: {"products": [...], "total": 100...}
+        """
+        # Validação em lote direto dos bytes (parser do pydantic-core, sem dicts intermediários)
+        envelope = PRODUCTS_RESPONSE_ADAPTER.validate_json(body)
+        products, total = envelope.products, envelope.total
+        return products, total if total is not None else len(products)
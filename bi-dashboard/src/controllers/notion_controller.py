@@ -1,25 +1,27 @@
 import os
 import requests
-from dotenv import load_dotenv
 from datetime import datetime as dt
+from data.http_session import create_http_session
+from interfaces.Istatus_notifier import IStatusNotifier
 
-load_dotenv()
 
-class NotionController:
-    def __init__(self):
+class NotionController(IStatusNotifier):
+    def __init__(self, session: requests.Session = None):
+        self.session = session or create_http_session()
         self.token = os.getenv("NOTION_TOKEN")
         self.block_id = os.getenv("NOTION_BLOCK_ID")
+        self.base_url = os.getenv("NOTION_API_BASE_URL", "https://api.notion.com/v1")
         self.headers = {
             "Authorization": f"Bearer {self.token}",
             "Notion-Version": "2022-06-28",
             "Content-Type": "application/json"
         }
 
-    def update_status(self, mensagem, is_ok=True):
+    def update_status(self, mensagem, is_ok=True, horario=None):
         """Atualiza o bloco de status no dashboard da Greg Company"""
-        url = f"https://api.notion.com/v1/blocks/{self.block_id}"
+        url = f"{self.base_url}/blocks/{self.block_id}"
         emoji = "🟢" if is_ok else "🔴"
-        horario = dt.now().strftime("%H:%M:%S")
+        horario = horario or dt.now().strftime("%H:%M:%S")
         
         payload = {
             "paragraph": {
@@ -28,11 +30,16 @@ class NotionController:
         }
         
         try:
-            response = requests.patch(url, headers=self.headers, json=payload)
+            response = self.session.patch(url, headers=self.headers, json=payload)
             if response.status_code != 200:
                 # Isso vai mostrar exatamente o que o Notion está reclamando
                 print(f"Erro do Notion ({response.status_code}): {response.json()}")
             return response.status_code == 200
         except Exception as e:
             print(f"Erro de conexão: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    def ping(self) -> bool:
+        """Envia um status de teste (opção 'Testar Conexão API Notion')"""
+        print("Enviando sinal de teste para o Notion...")
+        return self.update_status("Teste de API realizado com sucesso!", is_ok=True)
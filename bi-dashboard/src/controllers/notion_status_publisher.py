@@ -0,0 +1,101 @@
+import atexit
+import os
+import threading
+import time
+from datetime import datetime as dt
+from typing import Optional, Tuple
+from interfaces.Istatus_notifier import IStatusNotifier
+from controllers.notion_controller import NotionController
+from services.instrumentation import Instrumentation
+
+class NotionStatusPublisher(IStatusNotifier):
+    """
+    Publica o status no Notion em segundo plano.
+    O pipeline apenas deixa a mensagem e segue: uma thread worker faz o PATCH.
+    Como o bloco de status é um só, rajadas são aglutinadas (só a última vai)
+    e os envios respeitam o limite de requisições da API do Notion.
+    """
+
+    def __init__(self, controller: NotionController, min_interval: float = None,
+                 instrumentation: Instrumentation = None):
+        self.controller = controller
+        self.instrumentation = instrumentation or Instrumentation()
+        # O Notion aceita em média 3 requisições por segundo por integração
+        self.min_interval = min_interval if min_interval is not None else float(os.getenv("NOTION_MIN_INTERVAL", "0.35"))
+
+        self._pending: Optional[Tuple[str, bool, str]] = None
+        self._sending = False
+        self._closed = False
+        self._last_sent = 0.0
+        self._cond = threading.Condition()
+        self.sent = 0
+        self.coalesced = 0
+
+        self._worker = threading.Thread(target=self._run, name="notion-status-publisher", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    def update_status(self, mensagem, is_ok=True) -> bool:
+        """Enfileira o status e retorna na hora (True = aceito para envio)"""
+        horario = dt.now().strftime("%H:%M:%S")
+        with self._cond:
+            if self._closed:
+                return False
+            if self._pending is not None:
+                self.coalesced += 1
+            self._pending = (mensagem, is_ok, horario)
+            self._cond.notify_all()
+        return True
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Aguarda até o último status ter sido enviado"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._pending is not None or self._sending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 10.0):
+        """Envia o que estiver pendente e encerra o worker"""
+        if self._closed:
+            return
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._worker.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None and self._closed:
+                    return
+
+                # Rate limit: espera o intervalo mínimo; novas mensagens substituem a pendente
+                wait = self._last_sent + self.min_interval - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+
+                mensagem, is_ok, horario = self._pending
+                self._pending = None
+                self._sending = True
+
+            try:
+                # A thread worker não herda o contexto do pipeline: o envio é uma execução própria
+                with self.instrumentation.run("notify"), self.instrumentation.stage("notify") as st:
+                    st.items += 1
+                    self.controller.update_status(mensagem, is_ok=is_ok, horario=horario)
+            except Exception as e:
+                print(f"Erro ao publicar status no Notion: {e}")
+            finally:
+                with self._cond:
+                    self._sending = False
+                    self._last_sent = time.monotonic()
+                    self.sent += 1
+                    self._cond.notify_all()
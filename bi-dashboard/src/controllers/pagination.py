@@ -0,0 +1,83 @@
+import contextvars
+from abc import abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Tuple, TypeVar
+import requests
+from models.product_dto import ProductDTO
+from models.product_page import ProductPage
+from interfaces.Iproduct_source import IProductSource
+
+T = TypeVar("T")
+
+
+def iter_payloads(fetch: Callable[[int, int], Tuple[T, int]], page_size: int,
+                  max_concurrency: int = 1) -> Iterator[T]:
+    """
+    Gera as páginas do catálogo em ordem, sem acumular o catálogo em memória.
+    fetch(limit, skip) devolve (conteúdo da página, total do catálogo).
+    A primeira resposta traz o 'total'; as páginas seguintes são buscadas em
+    paralelo, com no máximo max_concurrency requisições à frente do consumidor.
+    Uma página que falha interrompe a geração: a exceção sobe para o chamador
+    (nunca um catálogo incompleto em silêncio).
+    """
+    first, total = fetch(page_size, 0)
+    if not first:
+        return
+
+    skips = iter(range(page_size, total, page_size))
+    pool = ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="page-fetch")
+    pending = deque()
+
+    def submit_next():
+        skip = next(skips, None)
+        if skip is not None:
+            # copy_context: as threads herdam a etapa ativa da instrumentação
+            pending.append(pool.submit(contextvars.copy_context().run, fetch, page_size, skip))
+
+    try:
+        for _ in range(max(1, max_concurrency)):
+            submit_next()
+        yield first
+
+        while pending:
+            payload, _ = pending.popleft().result()
+            if not payload:
+                break
+            submit_next()
+            yield payload
+    finally:
+        # Consumidor parou antes do fim (ou uma página falhou): nada novo sai para a rede
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_pages(fetch_page: Callable[[int, int], ProductPage], page_size: int,
+               max_concurrency: int = 1) -> Iterator[List[ProductDTO]]:
+    """iter_payloads sobre fetch_page: páginas de ProductDTO"""
+    def fetch(limit: int, skip: int) -> Tuple[List[ProductDTO], int]:
+        page = fetch_page(limit, skip)
+        return page.products, page.total
+    return iter_payloads(fetch, page_size, max_concurrency)
+
+
+class PagedProductSource(IProductSource):
+    """
+    Base das fontes paginadas: fetch_products e iter_pages saem de fetch_page.
+    max_concurrency limita as páginas em voo nos pipelines de catálogo completo.
+    """
+    max_concurrency: int = 1
+
+    @abstractmethod
+    def fetch_page(self, limit: int, skip: int) -> ProductPage:
+        """Uma única página; erros de rede sobem como RequestException."""
+        pass
+
+    def fetch_products(self, limit=10, skip=0) -> List[ProductDTO]:
+        try:
+            return self.fetch_page(limit, skip).products
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Erro ao acessar API: {e}")
+            return []
+
+    def iter_pages(self, page_size=50) -> Iterator[List[ProductDTO]]:
+        return iter_pages(self.fetch_page, page_size, self.max_concurrency)
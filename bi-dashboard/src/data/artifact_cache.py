@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+from interfaces.Iartifact_cache import IArtifactCache
+
+# Linhas por bloco no cálculo do hash (uma chamada a update() por bloco)
+_HASH_BLOCK = 10000
+
+
+def fingerprint_products(products, config: dict = None) -> str:
+    """
+    Impressão digital do conjunto de produtos limpos (saída do prepare_products)
+    + configuração do exportador. Normaliza os campos, então lista de DTOs e
+    ProductColumns com os mesmos dados geram o mesmo hash.
+    A ordem conta: ela também define a ordem das linhas no artefato.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(config or {}, sort_keys=True, default=str).encode("utf-8"))
+
+    if hasattr(products, "title_list"):
+        # ProductColumns: lê as colunas inteiras, sem montar uma linha por produto
+        rows = zip(products.ids.tolist(), products.title_list(), products.brands.tolist(),
+                   products.categories.tolist(), products.prices.tolist(), products.stocks.tolist(),
+                   products.statuses.tolist())
+    else:
+        rows = ((p.id, p.full_title, p.brand, p.category, p.price, p.stock, p.status) for p in products)
+
+    block = []
+    for pid, title, brand, category, price, stock, status in rows:
+        block.append(f"{int(pid)}\x1f{title}\x1f{brand}\x1f{category}\x1f{float(price)!r}\x1f{int(stock)}\x1f{status}")
+        if len(block) >= _HASH_BLOCK:
+            digest.update(("\x1e".join(block) + "\x1e").encode("utf-8"))
+            block = []
+    if block:
+        digest.update(("\x1e".join(block) + "\x1e").encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ArtifactCache(IArtifactCache):
+    """
+    Cache de artefatos endereçado por conteúdo (BI_ARTIFACT_DIR, padrão output/artifacts).
+    O manifest.json guarda:
+      - artifacts: impressão digital -> cópia do arquivo gerado (xlsx/csv/parquet)
+      - targets: último artefato/envio bem-sucedido de cada alvo (arquivo ou planilha do Rows)
+    Mantém os BI_ARTIFACT_KEEP artefatos usados mais recentemente.
+    """
+
+    def __init__(self, directory: str = None, keep: int = None):
+        self.directory = directory or os.getenv("BI_ARTIFACT_DIR", os.path.join("output", "artifacts"))
+        self.keep = keep if keep is not None else int(os.getenv("BI_ARTIFACT_KEEP", "10"))
+        self.manifest_path = os.path.join(self.directory, "manifest.json")
+        self._lock = threading.Lock()
+        self._manifest = self._load()
+
+    # --- Alvos (último resultado bem-sucedido) ---
+
+    def is_current(self, target: str, digest: str, path: str = None) -> bool:
+        with self._lock:
+            entry = self._manifest["targets"].get(target)
+        if not entry or entry["digest"] != digest:
+            return False
+        if path is None:
+            return True
+        # O arquivo precisa ser exatamente o que foi gerado (não apagado nem editado à mão)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return st.st_size == entry.get("size") and st.st_mtime_ns == entry.get("mtime_ns")
+
+    def mark(self, target: str, digest: str, path: str = None):
+        entry = {"digest": digest, "at": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+        if path is not None:
+            st = os.stat(path)
+            entry.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+        with self._lock:
+            self._manifest["targets"][target] = entry
+            self._save()
+
+    def forget(self, target: str):
+        with self._lock:
+            if self._manifest["targets"].pop(target, None) is not None:
+                self._save()
+
+    # --- Artefatos por conteúdo ---
+
+    def lookup(self, digest: str) -> Optional[str]:
+        with self._lock:
+            entry = self._manifest["artifacts"].get(digest)
+        if not entry:
+            return None
+        path = os.path.join(self.directory, entry["file"])
+        return path if os.path.exists(path) else None
+
+    def store(self, digest: str, source_path: str, kind: str, rows: int = 0) -> Optional[str]:
+        name = digest + os.path.splitext(source_path)[1]
+        path = os.path.join(self.directory, name)
+        try:
+            # Cópia, não hard link: os writers regravam o destino no mesmo inode
+            self._copy(source_path, path)
+        except OSError as e:
+            print(f"⚠️ Artefato não guardado no cache ({source_path}): {e}")
+            return None
+
+        with self._lock:
+            self._manifest["artifacts"][digest] = {
+                "file": name, "kind": kind, "rows": rows, "size": os.path.getsize(path),
+                "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"), "used_at": time.time(),
+            }
+            self._evict()
+            self._save()
+        return path
+
+    def restore(self, digest: str, dest_path: str) -> bool:
+        path = self.lookup(digest)
+        if path is None:
+            return False
+        try:
+            self._copy(path, dest_path)
+        except OSError as e:
+            print(f"⚠️ Não foi possível reaproveitar o artefato em cache: {e}")
+            return False
+        with self._lock:
+            self._manifest["artifacts"][digest]["used_at"] = time.time()
+            self._save()
+        return True
+
+    # --- Internos ---
+
+    @staticmethod
+    def _copy(source: str, dest: str):
+        # Cópia para um .tmp + os.replace: quem lê o destino nunca vê um arquivo pela metade
+        os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+        tmp_path = f"{dest}.tmp"
+        shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, dest)
+
+    def _evict(self):
+        artifacts = self._manifest["artifacts"]
+        for digest in sorted(artifacts, key=lambda d: artifacts[d]["used_at"])[:max(0, len(artifacts) - self.keep)]:
+            entry = artifacts.pop(digest)
+            try:
+                os.remove(os.path.join(self.directory, entry["file"]))
+            except OSError:
+                pass
+
+    def _load(self) -> dict:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {"artifacts": data.get("artifacts", {}), "targets": data.get("targets", {})}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Manifesto de artefatos ignorado ({self.manifest_path}): {e}")
+        return {"artifacts": {}, "targets": {}}
+
+    def _save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._manifest, f, indent=1)
+        os.replace(tmp_path, self.manifest_path)
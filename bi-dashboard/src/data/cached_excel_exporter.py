@@ -0,0 +1,47 @@
+import os
+from typing import Iterable, List
+from interfaces.Iexcel_exporter import IExcelExporter
+from interfaces.Iartifact_cache import IArtifactCache
+from models.cleaned_product_dto import CleanedProductDTO
+from data.artifact_cache import fingerprint_products
+from data.excel_exporter import ExcelExporter
+from data.export_writers import EXPORT_COLUMNS
+
+
+class CachedExcelExporter(IExcelExporter):
+    """
+    Decorator do ExcelExporter com cache de artefatos por impressão digital:
+    - mesmo conteúdo do último arquivo gerado (e o arquivo intacto): nada a fazer
+    - conteúdo já gerado antes: o arquivo é copiado do cache, sem regerar
+    - conteúdo novo: gera normalmente e guarda uma cópia no cache
+    O streaming (send_chunks_to_excel) passa direto: o hash só existe no fim.
+    """
+
+    def __init__(self, exporter: ExcelExporter, cache: IArtifactCache):
+        self.exporter = exporter
+        self.cache = cache
+
+    def send_to_excel(self, products: List[CleanedProductDTO], filename: str) -> bool:
+        path = os.path.join(self.exporter.directory, filename)
+        # Formato e colunas entram no hash: mudar qualquer um deles gera outro artefato
+        digest = fingerprint_products(products, {
+            "exporter": "excel", "format": os.path.splitext(filename)[1].lower(), "columns": EXPORT_COLUMNS,
+        })
+
+        if self.cache.is_current(path, digest, path=path):
+            print(f"✅ Dados inalterados desde a última exportação: {path} (hash {digest[:12]})")
+            return True
+
+        if self.cache.restore(digest, path):
+            self.cache.mark(path, digest, path=path)
+            print(f"✅ Relatório servido do cache de artefatos em: {path} (hash {digest[:12]})")
+            return True
+
+        sucesso = self.exporter.send_to_excel(products, filename)
+        if sucesso:
+            self.cache.store(digest, path, kind="excel", rows=len(products))
+            self.cache.mark(path, digest, path=path)
+        return sucesso
+
+    def send_chunks_to_excel(self, chunks: Iterable[List[CleanedProductDTO]], filename: str) -> bool:
+        return self.exporter.send_chunks_to_excel(chunks, filename)
@@ -0,0 +1,51 @@
+import os
+from typing import Dict, Iterable, List
+from interfaces.Iproduct_exporter import IProductExporter
+from interfaces.Iartifact_cache import IArtifactCache
+from models.cleaned_product_dto import CleanedProductDTO
+from data.artifact_cache import fingerprint_products
+from data.rows_exporter import RowsExporter, HEADERS
+from services.metrics_accumulator import MetricsAccumulator
+
+
+class CachedRowsExporter(IProductExporter):
+    """
+    Decorator do RowsExporter: se os produtos, as métricas do rodapé e a
+    planilha de destino têm a mesma impressão digital do último envio
+    bem-sucedido, não há nada a enviar (nem o diff linha a linha é calculado).
+    Blocos pendentes de um envio com falha sempre desativam o atalho.
+    """
+
+    def __init__(self, exporter: RowsExporter, cache: IArtifactCache):
+        self.exporter = exporter
+        self.cache = cache
+        self.target = f"rows:{exporter.spreadsheet_id}/{exporter.table_id}"
+
+    def send_to_rows(self, products: List[CleanedProductDTO], metrics: Dict[str, float]) -> bool:
+        return self._push(products, metrics, self.exporter.send_to_rows)
+
+    def sync_changes_to_rows(self, products: List[CleanedProductDTO], metrics: Dict[str, float]) -> bool:
+        return self._push(products, metrics, self.exporter.sync_changes_to_rows)
+
+    def send_chunks_to_rows(self, chunks: Iterable[List[CleanedProductDTO]], accumulator: MetricsAccumulator) -> bool:
+        # O streaming reescreve a planilha sem hash prévio: o próximo envio não pode pular
+        self.cache.forget(self.target)
+        return self.exporter.send_chunks_to_rows(chunks, accumulator)
+
+    def resume_failed_upload(self) -> bool:
+        return self.exporter.resume_failed_upload()
+
+    def _push(self, products, metrics, send) -> bool:
+        digest = fingerprint_products(products, {
+            "exporter": "rows", "base_url": self.exporter.base_url, "headers": HEADERS, "metrics": metrics,
+        })
+        if not os.path.exists(self.exporter.pending_path) and self.cache.is_current(self.target, digest):
+            print(f"✅ Dados inalterados desde o último envio ao Rows.com (hash {digest[:12]}). Nada a enviar.")
+            return True
+
+        # Antes do envio: se ele falhar no meio, a planilha já não é a do último hash
+        self.cache.forget(self.target)
+        sucesso = send(products, metrics)
+        if sucesso:
+            self.cache.mark(self.target, digest)
+        return sucesso
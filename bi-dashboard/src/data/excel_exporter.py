@@ -1,14 +1,16 @@
-import pandas as pd
 import os
-from dataclasses import asdict
-from typing import List
-from dotenv import load_dotenv
+from typing import Iterable, List
 from interfaces.Iexcel_exporter import IExcelExporter
 from models.cleaned_product_dto import CleanedProductDTO
+from data.export_writers import writer_for
 
-load_dotenv()
 
 class ExcelExporter(IExcelExporter):
+    """
+    Exporta o relatório administrativo. O formato sai da extensão do arquivo:
+    .xlsx (openpyxl write_only), .csv ou .parquet (pyarrow).
+    """
+
     def __init__(self, directory: str = None):
         # Utiliza o caminho da FATEC configurado no .env ou um padrão
         self.directory = directory or os.getenv("caminho_fatec", "output")
@@ -17,36 +19,41 @@ class ExcelExporter(IExcelExporter):
 
     def send_to_excel(self, products: List[CleanedProductDTO], filename: str) -> bool:
         """Transforma a lista de DTOs em uma planilha configurada para BI"""
+        return self.send_chunks_to_excel([products], filename)
+
+    def send_chunks_to_excel(self, chunks: Iterable[List[CleanedProductDTO]], filename: str) -> bool:
+        """
+        Grava o arquivo bloco a bloco: memória constante em qualquer formato.
+        A escrita vai para um temporário na mesma pasta e só substitui o
+        relatório anterior (os.replace) se a exportação terminar sem erro.
+        """
+        path = os.path.join(self.directory, filename)
+        base, extension = os.path.splitext(path)
+        tmp_path = f"{base}.tmp{extension}"
+        writer = None
+        sucesso = False
         try:
-            # Converte a lista de objetos CleanedProductDTO em uma lista de dicionários
-            data_dicts = [asdict(p) for p in products]
-            df = pd.DataFrame(data_dicts)
-
-            # Mapeamento de colunas para o relatório administrativo do Greg Company
-            cols_to_export = [
-                'id', 'full_title', 'category', 'brand', 
-                'price', 'stock', 'status', 'total_stock_value'
-            ]
-            
-            # Renomeação para nomes amigáveis no Excel
-            df_final = df[cols_to_export].rename(columns={
-                'id': 'ID',
-                'full_title': 'Produto',
-                'category': 'Categoria',
-                'brand': 'Marca',
-                'price': 'Preço Unitário ($)',
-                'stock': 'Estoque (Qtd)',
-                'status': 'Situação',
-                'total_stock_value': 'Patrimônio em Estoque'
-            })
-
-            path = os.path.join(self.directory, filename)
-            
-            # Salvando o arquivo no diretório configurado
-            df_final.to_excel(path, index=False)
-            print(f"✅ Relatório Excel gerado com sucesso em: {path}")
+            writer = writer_for(tmp_path)
+            for chunk in chunks:
+                writer.write_chunk(chunk)
+            writer.close()
+            rows, writer = writer.rows, None
+            os.replace(tmp_path, path)
+            sucesso = True
+
+            print(f"✅ Relatório gerado com sucesso em: {path} ({rows} linhas)")
             return True
-            
+
         except Exception as e:
-            print(f"❌ Erro ao salvar o arquivo Excel: {e}")
-            return False
\ No newline at end of file
+            print(f"❌ Erro ao salvar o arquivo {extension}: {e}")
+            return False
+
+        finally:
+            if writer is not None:
+                # Falha no meio do streaming: fecha o arquivo/gerador antes de descartar o temporário
+                try:
+                    writer.close()
+                except Exception:
+                    pass
+            if not sucesso and os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,141 @@
+import csv
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+# Mapeamento de colunas para o relatório administrativo do Greg Company
+# (atributo do DTO -> nome amigável na planilha)
+EXPORT_COLUMNS = {
+    'id': 'ID',
+    'full_title': 'Produto',
+    'category': 'Categoria',
+    'brand': 'Marca',
+    'price': 'Preço Unitário ($)',
+    'stock': 'Estoque (Qtd)',
+    'status': 'Situação',
+    'total_stock_value': 'Patrimônio em Estoque'
+}
+
+# Atributo do DTO -> coluna equivalente em ProductColumns
+_COLUMNAR_FIELDS = {
+    'id': 'ids',
+    'full_title': 'full_titles',
+    'category': 'categories',
+    'brand': 'brands',
+    'price': 'prices',
+    'stock': 'stocks',
+    'status': 'statuses',
+    'total_stock_value': 'total_stock_values'
+}
+
+
+def chunk_columns(chunk) -> Dict[str, list]:
+    """Colunas de um bloco, seja uma lista de CleanedProductDTO ou um ProductColumns"""
+    if hasattr(chunk, "status_codes"):
+        return {attr: getattr(chunk, field).tolist() for attr, field in _COLUMNAR_FIELDS.items()}
+    return {attr: [getattr(p, attr) for p in chunk] for attr in EXPORT_COLUMNS}
+
+
+class ExportWriter(ABC):
+    """Escritor incremental: abre o arquivo, recebe blocos e fecha no final"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+
+    @abstractmethod
+    def write_chunk(self, chunk):
+        """Acrescenta um bloco (lista de DTOs ou ProductColumns) ao arquivo"""
+        pass
+
+    @abstractmethod
+    def close(self):
+        """Finaliza o arquivo e libera os recursos"""
+        pass
+
+
+class XlsxExportWriter(ExportWriter):
+    """openpyxl em modo write_only: as linhas vão direto para o XML, sem manter a planilha em memória"""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        from openpyxl import Workbook
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet()
+        self.sheet.append(list(EXPORT_COLUMNS.values()))
+
+    def write_chunk(self, chunk):
+        for p in chunk:
+            self.sheet.append([getattr(p, attr) for attr in EXPORT_COLUMNS])
+        self.rows += len(chunk)
+
+    def close(self):
+        self.workbook.save(self.path)
+
+
+class CsvExportWriter(ExportWriter):
+    def __init__(self, path: str):
+        super().__init__(path)
+        # utf-8-sig: o Excel reconhece os acentos ao abrir o CSV direto
+        self.file = open(path, "w", newline="", encoding="utf-8-sig")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(EXPORT_COLUMNS.values())
+
+    def write_chunk(self, chunk):
+        columns = chunk_columns(chunk)
+        self.writer.writerows(zip(*columns.values()))
+        self.rows += len(chunk)
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetExportWriter(ExportWriter):
+    """Um row group por bloco. Requer pyarrow (requirements.txt)."""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Exportação Parquet requer o pacote 'pyarrow' (pip install pyarrow)") from e
+        self.pa = pa
+        self.schema = pa.schema([
+            ('ID', pa.int64()),
+            ('Produto', pa.string()),
+            ('Categoria', pa.string()),
+            ('Marca', pa.string()),
+            ('Preço Unitário ($)', pa.float64()),
+            ('Estoque (Qtd)', pa.int64()),
+            ('Situação', pa.string()),
+            ('Patrimônio em Estoque', pa.float64()),
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write_chunk(self, chunk):
+        if not len(chunk):
+            return
+        columns = chunk_columns(chunk)
+        arrays: List = [self.pa.array(columns[attr], type=field.type)
+                        for attr, field in zip(EXPORT_COLUMNS, self.schema)]
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+        self.rows += len(chunk)
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {
+    ".xlsx": XlsxExportWriter,
+    ".csv": CsvExportWriter,
+    ".parquet": ParquetExportWriter,
+}
+
+
+def writer_for(path: str) -> ExportWriter:
+    """Escolhe o formato pela extensão do arquivo"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in WRITERS:
+        raise ValueError(f"Formato '{extension}' não suportado. Use: {', '.join(WRITERS)}")
+    return WRITERS[extension](path)
@@ -0,0 +1,57 @@
+import os
+from typing import Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Status que valem nova tentativa: rate limit (429) e falhas temporárias do servidor
+RETRY_STATUS = (429, 500, 502, 503, 504)
+RETRY_METHODS = frozenset({"GET", "PATCH", "POST"})
+
+class PooledSession(requests.Session):
+    """Session com pool de conexões keep-alive e timeout padrão em toda chamada"""
+
+    def __init__(self, timeout: Tuple[float, float]):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        # Nenhuma chamada pode ficar pendurada para sempre
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def create_http_session(pool_size: Optional[int] = None,
+                        connect_timeout: Optional[float] = None,
+                        read_timeout: Optional[float] = None,
+                        max_retries: Optional[int] = None,
+                        backoff_factor: Optional[float] = None) -> PooledSession:
+    """
+    Cria a Session compartilhada pelos controllers e exporters.
+    Valores não informados vêm do .env (HTTP_POOL_SIZE, HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT, HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR).
+    """
+    pool_size = pool_size if pool_size is not None else int(os.getenv("HTTP_POOL_SIZE", "10"))
+    connect_timeout = connect_timeout if connect_timeout is not None else float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    read_timeout = read_timeout if read_timeout is not None else float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+    max_retries = max_retries if max_retries is not None else int(os.getenv("HTTP_MAX_RETRIES", "3"))
+    backoff_factor = backoff_factor if backoff_factor is not None else float(os.getenv("HTTP_BACKOFF_FACTOR", "0.5"))
+
+    # Backoff exponencial: backoff_factor * 2^(tentativa - 1), respeitando Retry-After
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=RETRY_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+    # pool_connections = quantos hosts mantemos em cache,
+    # pool_maxsize = conexões keep-alive por host
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = PooledSession(timeout=(connect_timeout, read_timeout))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -1,79 +1,340 @@
 import requests
+import contextvars
+import json
 import os
-from typing import List, Dict
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Dict, Optional, Tuple
 from interfaces.Iproduct_exporter import IProductExporter
 from models.cleaned_product_dto import CleanedProductDTO
-from controllers.notion_controller import NotionController
+from interfaces.Istatus_notifier import IStatusNotifier
+from data.http_session import create_http_session
+from data.rows_sync_state import RowsSyncState, row_hash
+from services.metrics_accumulator import MetricsAccumulator
 
-load_dotenv()
+
+# Uma linha da planilha no formato da API: [{"value": "..."}, ...]
+Row = List[Dict[str, str]]
+
+HEADERS = ["ID", "Produto", "Categoria", "Marca", "Preço ($)", "Estoque", "Situação", "Patrimônio ($)", "Total Patrimônio", "Alertas Críticos", "Categorias Únicas"]
 
 class RowsExporter(IProductExporter):
-    def __init__(self, notion_controller : NotionController):
+    def __init__(self, notion_controller : IStatusNotifier, session: requests.Session = None):
         self.api_key = os.getenv("ROWS_API_KEY")
         self.spreadsheet_id = os.getenv("ROWS_SPREADSHEET_ID")
         self.table_id = os.getenv("ROWS_TABLE_ID")
+        self.base_url = os.getenv("ROWS_API_BASE_URL", "https://api.rows.com/v1")
         self.notion = notion_controller
+        self.session = session or create_http_session()
+
+        # Modo em blocos: planilhas maiores que chunk_size linhas são enviadas em ranges paralelos
+        self.chunk_size = int(os.getenv("ROWS_CHUNK_SIZE", "500"))
+        self.max_parallel = int(os.getenv("ROWS_MAX_PARALLEL", "4"))
+        state_dir = os.getenv("ROWS_STATE_DIR", "output")
+        self.pending_path = os.path.join(state_dir, "rows_pending_upload.json")
+        self.sync_state = RowsSyncState(os.path.join(state_dir, "rows_sync_state.json"),
+                                        self.spreadsheet_id, self.table_id)
         
     def send_to_rows(self, products: List[CleanedProductDTO], metrics: Dict[str, float]) -> bool:
         try:
-            # 1. Configuração do Range Dinâmico
-            num_rows = len(products) + 2 # +1 cabeçalho, +1 rodapé
-            url_cells = f"https://api.rows.com/v1/spreadsheets/{self.spreadsheet_id}/tables/{self.table_id}/cells/A1:K{num_rows}"
-            
-            headers = ["ID", "Produto", "Categoria", "Marca", "Preço ($)", "Estoque", "Situação", "Patrimônio ($)", "Total Patrimônio", "Alertas Críticos", "Categorias Únicas"]
-            matrix = []
-            
-            # Cabeçalho
-            matrix.append([{"value": str(h)} for h in headers])
-            
-            # 2. Dados dos Produtos (Usando os atributos do DTO)
-            for p in products:
-                product_row = [
-                    {"value": str(p.id)},
-                    {"value": p.full_title},
-                    {"value": p.category},
-                    {"value": p.brand},
-                    {"value": str(p.price)},
-                    {"value": str(p.stock)},
-                    {"value": str(p.status)}, # O Enum ProductStatus é convertido em string
-                    {"value": str(p.total_stock_value)},
-                    {"value": ""}, {"value": ""}, {"value": ""}
-                ]
-                matrix.append(product_row)
-
-            # 3. Rodapé de Métricas
-            metrics_row = [
-                {"value": "RESUMO GERAL"}, 
-                {"value": ""}, {"value": ""}, {"value": ""}, 
-                {"value": ""}, {"value": ""}, {"value": ""}, {"value": ""},
-                {"value": str(metrics.get("total_value", 0))},
-                {"value": str(metrics.get("critical_alerts", 0))},
-                {"value": str(metrics.get("unique_categories", 0))}
-            ]
-            matrix.append(metrics_row)
-
-            # 4. Envio para a API
-            payload = {"cells": matrix}
-            request_headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-                "Accept": "application/json"
-            }
-
-            response = requests.post(url_cells, json=payload, headers=request_headers)
-            
-            if response.status_code in [200, 201, 202]:
-                print(f"✅ SUCESSO: Dashboard Greg Company atualizado via POST!")
-                if self.notion:
-                    self.notion.update_status("Sincronização Rows.com realizada com sucesso!", is_ok=True)
-                return True
+            # Cabeçalho + Dados dos Produtos (Usando os atributos do DTO)
+            matrix = [self._header_row()]
+            matrix.extend(self._product_row(p) for p in products)
+            footer = self._metrics_row(metrics)
+
+            # Snapshot da tabela completa: base para os próximos envios incrementais
+            rows = {p.id: (i + 2, row_hash(cells)) for i, (p, cells) in enumerate(zip(products, matrix[1:]))}
+            self.sync_state.reset(rows, footer_row=len(matrix) + 1, footer_hash=row_hash(footer))
+
+            if len(matrix) > self.chunk_size:
+                sucesso = self._send_chunked(matrix, metrics)
             else:
-                print(f"❌ ERRO API ROWS ({response.status_code}): {response.text}")
-                return False
+                # 1. Configuração do Range Dinâmico
+                num_rows = len(products) + 2 # +1 cabeçalho, +1 rodapé
+
+                # 2. Envio para a API (com o Rodapé de Métricas no fim)
+                sucesso = self._post_range(f"A1:K{num_rows}", matrix + [footer])
+                if sucesso:
+                    print(f"✅ SUCESSO: Dashboard Greg Company atualizado via POST!")
+                    self._clear_pending()
+                    self._notify_success()
+
+            if sucesso:
+                self.sync_state.save()
+            return sucesso
                 
         except Exception as e:
+            self._notify_failure(e)
+            return False
+
+    def sync_changes_to_rows(self, products: List[CleanedProductDTO], metrics: Dict[str, float]) -> bool:
+        """
+        Envio incremental: compara o hash de cada linha com o último envio
+        bem-sucedido e atualiza apenas os ranges alterados, novos ou removidos.
+        Sem snapshot anterior, faz o envio completo.
+        """
+        state = self.sync_state
+        if not state.load():
+            print("ℹ️ Nenhum snapshot anterior do Rows.com: enviando a tabela completa.")
+            return self.send_to_rows(products, metrics)
+
+        try:
+            updates: Dict[int, Row] = {}
+            added = []
+            seen = set()
+            changed = 0
+
+            for p in products:
+                seen.add(p.id)
+                cells = self._product_row(p)
+                digest = row_hash(cells)
+                current = state.rows.get(p.id)
+                if current is None:
+                    added.append((p.id, cells, digest))
+                elif current[1] != digest:
+                    updates[current[0]] = cells
+                    state.rows[p.id] = (current[0], digest)
+                    changed += 1
+
+            # Removidos: a linha é limpa e fica livre para os próximos produtos novos
+            removed = [pid for pid in state.rows if pid not in seen]
+            for pid in removed:
+                row, _ = state.rows.pop(pid)
+                updates[row] = self._blank_row()
+                state.free_rows.append(row)
+            state.free_rows.sort()
+
+            # Novos: reaproveitam linhas livres ou entram no lugar do rodapé (que desce)
+            old_footer_row = state.footer_row
+            for pid, cells, digest in added:
+                if state.free_rows:
+                    row = state.free_rows.pop(0)
+                else:
+                    row = state.footer_row
+                    state.footer_row += 1
+                updates[row] = cells
+                state.rows[pid] = (row, digest)
+
+            footer_cells = self._metrics_row(metrics)
+            footer_digest = row_hash(footer_cells)
+            footer_moved = state.footer_row != old_footer_row
+            footer_changed = footer_digest != state.footer_hash
+
+            print(f"🔁 Diff Rows.com: {changed} alterados | {len(added)} novos | {len(removed)} removidos")
+            if not updates and not footer_changed:
+                print("✅ Dashboard já está atualizado. Nada a enviar.")
+                return True
+
+            chunks = self._coalesce_ranges(updates)
+            footer = (f"A{state.footer_row}:K{state.footer_row}", [footer_cells])
+            if not footer_changed and not footer_moved:
+                footer = None
+
+            state.footer_hash = footer_digest
+            sucesso = self._upload_chunks(chunks, footer)
+            if sucesso:
+                state.save()
+            return sucesso
+
+        except Exception as e:
+            self._notify_failure(e)
+            return False
+
+    def resume_failed_upload(self) -> bool:
+        """Reenvia apenas os ranges que falharam na última execução e, por fim, o rodapé"""
+        pending = self._load_pending()
+        if not pending:
+            print("ℹ️ Nenhum envio pendente para o Rows.com.")
+            return True
+
+        try:
+            chunks = [(c["range"], c["cells"]) for c in pending["chunks"]]
+            footer = (pending["footer"]["range"], pending["footer"]["cells"]) if pending["footer"] else None
+            sucesso = self._upload_chunks(chunks, footer)
+            if sucesso and pending.get("sync_state") and self.sync_state.restore(pending["sync_state"]):
+                # A planilha agora é a do envio interrompido: o próximo diff parte dela
+                self.sync_state.save()
+            return sucesso
+        except Exception as e:
+            self._notify_failure(e)
+            return False
+
+    def _send_chunked(self, matrix: List[Row], metrics: Dict[str, float]) -> bool:
+        """Divide a planilha em ranges de chunk_size linhas e envia em paralelo"""
+        chunks = []
+        for start in range(0, len(matrix), self.chunk_size):
+            block = matrix[start:start + self.chunk_size]
+            first_row = start + 1
+            chunks.append((f"A{first_row}:K{first_row + len(block) - 1}", block))
+
+        footer_row = len(matrix) + 1
+        footer = (f"A{footer_row}:K{footer_row}", [self._metrics_row(metrics)])
+        return self._upload_chunks(chunks, footer)
+
+    def _coalesce_ranges(self, updates: Dict[int, Row]) -> List[Tuple[str, List[Row]]]:
+        """Agrupa linhas consecutivas em um único range (até chunk_size linhas)"""
+        chunks = []
+        block: List[Row] = []
+        first_row = prev_row = None
+        for row in sorted(updates):
+            if block and (row != prev_row + 1 or len(block) >= self.chunk_size):
+                chunks.append((f"A{first_row}:K{prev_row}", block))
+                block = []
+            if not block:
+                first_row = row
+            block.append(updates[row])
+            prev_row = row
+        if block:
+            chunks.append((f"A{first_row}:K{prev_row}", block))
+        return chunks
+
+    def _upload_chunks(self, chunks: List[Tuple[str, List[Row]]], footer: Optional[Tuple[str, List[Row]]]) -> bool:
+        workers = max(1, min(self.max_parallel, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # copy_context: as threads herdam a etapa ativa da instrumentação
+            futures = [pool.submit(contextvars.copy_context().run, self._post_range, *c) for c in chunks]
+            results = [f.result() for f in futures]
+
+        failed = [c for c, ok in zip(chunks, results) if not ok]
+        if failed:
+            # O rodapé fica para o resume: só é escrito depois que todos os ranges entrarem
+            self._save_pending(failed, footer)
+            print(f"⚠️ {len(failed)}/{len(chunks)} blocos falharam. Use resume_failed_upload() para reenviar.")
             if self.notion:
-                self.notion.update_status(f"Erro Interno no RowsExporter: {str(e)[:30]}", is_ok=False)
-            print(f"💥 Falha na execução do RowsExporter: {e}")
-            return False
\ No newline at end of file
+                self.notion.update_status(f"Rows.com: {len(failed)} blocos pendentes", is_ok=False)
+            return False
+
+        if footer and not self._post_range(*footer):
+            self._save_pending([], footer)
+            return False
+
+        self._clear_pending()
+        print(f"✅ SUCESSO: Dashboard Greg Company atualizado em {len(chunks)} blocos!")
+        self._notify_success()
+        return True
+
+    def send_chunks_to_rows(self, chunks: Iterable[List[CleanedProductDTO]], accumulator: MetricsAccumulator) -> bool:
+        """
+        Envio em streaming: cada bloco vai para o seu próprio range (A{n}:K{m}).
+        O rodapé só é escrito no final, quando o acumulador já viu o catálogo todo.
+        """
+        try:
+            # O layout será reescrito sem snapshot: o próximo envio incremental recomeça do zero
+            self.sync_state.clear()
+            if not self._post_range("A1:K1", [self._header_row()]):
+                return False
+
+            next_row = 2
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                matrix = [self._product_row(p) for p in chunk]
+                last_row = next_row + len(matrix) - 1
+                if not self._post_range(f"A{next_row}:K{last_row}", matrix):
+                    return False
+                next_row = last_row + 1
+
+            if not self._post_range(f"A{next_row}:K{next_row}", [self._metrics_row(accumulator.metrics())]):
+                return False
+
+            print(f"✅ SUCESSO: Dashboard Greg Company atualizado em streaming ({next_row - 2} produtos)!")
+            self._notify_success()
+            return True
+
+        except Exception as e:
+            self._notify_failure(e)
+            return False
+
+    # --- Montagem das linhas ---
+
+    def _header_row(self) -> Row:
+        return [{"value": str(h)} for h in HEADERS]
+
+    def _product_row(self, p: CleanedProductDTO) -> Row:
+        # Usando os atributos do DTO
+        return [
+            {"value": str(p.id)},
+            {"value": p.full_title},
+            {"value": p.category},
+            {"value": p.brand},
+            {"value": str(p.price)},
+            {"value": str(p.stock)},
+            {"value": str(p.status)}, # O Enum ProductStatus é convertido em string
+            {"value": str(p.total_stock_value)},
+            {"value": ""}, {"value": ""}, {"value": ""}
+        ]
+
+    def _blank_row(self) -> Row:
+        return [{"value": ""} for _ in HEADERS]
+
+    def _metrics_row(self, metrics: Dict[str, float]) -> Row:
+        return [
+            {"value": "RESUMO GERAL"}, 
+            {"value": ""}, {"value": ""}, {"value": ""}, 
+            {"value": ""}, {"value": ""}, {"value": ""}, {"value": ""},
+            {"value": str(metrics.get("total_value", 0))},
+            {"value": str(metrics.get("critical_alerts", 0))},
+            {"value": str(metrics.get("unique_categories", 0))}
+        ]
+
+    # --- Comunicação com a API ---
+
+    def _post_range(self, cell_range: str, matrix: List[Row]) -> bool:
+        """
+        Um POST por range. Os retries ficam só na Session compartilhada (urllib3 Retry):
+        5xx/429 e falhas de conexão com backoff; 4xx (auth, validação) falha na hora.
+        """
+        url_cells = f"{self.base_url}/spreadsheets/{self.spreadsheet_id}/tables/{self.table_id}/cells/{cell_range}"
+        payload = {"cells": matrix}
+        request_headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+
+        try:
+            response = self.session.post(url_cells, json=payload, headers=request_headers)
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️ Falha de rede no range {cell_range}: {e}")
+            return False
+
+        if response.status_code in [200, 201, 202]:
+            return True
+        print(f"❌ ERRO API ROWS ({response.status_code}): {response.text}")
+        return False
+
+    # --- Estado de envios pendentes (resume) ---
+
+    def _load_pending(self) -> Optional[dict]:
+        if not os.path.exists(self.pending_path):
+            return None
+        with open(self.pending_path, "r", encoding="utf-8") as f:
+            pending = json.load(f)
+        if pending.get("spreadsheet_id") != self.spreadsheet_id or pending.get("table_id") != self.table_id:
+            return None
+        return pending
+
+    def _save_pending(self, chunks: List[Tuple[str, List[Row]]], footer: Tuple[str, List[Row]]):
+        # Junto com os blocos vai o snapshot que a planilha terá quando o resume terminar
+        os.makedirs(os.path.dirname(self.pending_path) or ".", exist_ok=True)
+        pending = {
+            "spreadsheet_id": self.spreadsheet_id,
+            "table_id": self.table_id,
+            "chunks": [{"range": r, "cells": cells} for r, cells in chunks],
+            "footer": {"range": footer[0], "cells": footer[1]} if footer else None,
+            "sync_state": self.sync_state.to_dict(),
+        }
+        with open(self.pending_path, "w", encoding="utf-8") as f:
+            json.dump(pending, f, ensure_ascii=False)
+
+    def _clear_pending(self):
+        if os.path.exists(self.pending_path):
+            os.remove(self.pending_path)
+
+    def _notify_success(self):
+        if self.notion:
+            self.notion.update_status("Sincronização Rows.com realizada com sucesso!", is_ok=True)
+
+    def _notify_failure(self, e: Exception):
+        if self.notion:
+            self.notion.update_status(f"Erro Interno no RowsExporter: {str(e)[:30]}", is_ok=False)
+        print(f"💥 Falha na execução do RowsExporter: {e}")
@@ -0,0 +1,78 @@
+import hashlib
+import json
+import os
+from typing import Dict, List, Tuple
+
+def row_hash(cells: List[Dict[str, str]]) -> str:
+    """Hash de conteúdo de uma linha da planilha (o que de fato foi enviado ao Rows)"""
+    raw = "\x1f".join(c["value"] for c in cells)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class RowsSyncState:
+    """
+    Snapshot local do último envio bem-sucedido ao Rows.com:
+    para cada produto, a linha que ele ocupa e o hash do conteúdo.
+    Permite enviar apenas as linhas alteradas, novas ou removidas.
+    """
+
+    def __init__(self, path: str, spreadsheet_id: str, table_id: str):
+        self.path = path
+        self.spreadsheet_id = spreadsheet_id
+        self.table_id = table_id
+        self.rows: Dict[int, Tuple[int, str]] = {}
+        self.free_rows: List[int] = []
+        self.footer_row = 0
+        self.footer_hash = ""
+
+    def load(self) -> bool:
+        """Carrega o snapshot; False se não existir ou for de outra planilha"""
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Snapshot do Rows ignorado ({self.path}): {e}")
+            return False
+
+        return self.restore(data)
+
+    def restore(self, data: dict) -> bool:
+        """Aplica um snapshot serializado (to_dict); False se for de outra planilha"""
+        if data.get("spreadsheet_id") != self.spreadsheet_id or data.get("table_id") != self.table_id:
+            return False
+
+        self.rows = {int(pid): (entry[0], entry[1]) for pid, entry in data["rows"].items()}
+        self.free_rows = sorted(data.get("free_rows", []))
+        self.footer_row = data["footer_row"]
+        self.footer_hash = data.get("footer_hash", "")
+        return True
+
+    def reset(self, rows: Dict[int, Tuple[int, str]], footer_row: int, footer_hash: str):
+        self.rows = rows
+        self.free_rows = []
+        self.footer_row = footer_row
+        self.footer_hash = footer_hash
+
+    def to_dict(self) -> dict:
+        return {
+            "spreadsheet_id": self.spreadsheet_id,
+            "table_id": self.table_id,
+            "rows": {str(pid): [row, h] for pid, (row, h) in self.rows.items()},
+            "free_rows": self.free_rows,
+            "footer_row": self.footer_row,
+            "footer_hash": self.footer_hash,
+        }
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = self.to_dict()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
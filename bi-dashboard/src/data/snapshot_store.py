@@ -0,0 +1,188 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Iterable, List, Tuple
+from enums.product_status import ProductStatus
+from models.cleaned_product_dto import CleanedProductDTO
+from interfaces.Isnapshot_store import ISnapshotStore
+
+# Status gravado pelo nome do enum (OK, REPOR...): independe do rótulo exibido
+_STATUS_BY_LABEL = {s.value.capitalize(): s for s in ProductStatus} | {s.value: s for s in ProductStatus}
+_STATUS_ORDER = list(ProductStatus)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id     INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_at     TEXT NOT NULL,
+    pipeline   TEXT NOT NULL,
+    products   INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_runs_run_at ON runs (run_at);
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    product_id        INTEGER NOT NULL,
+    run_id            INTEGER NOT NULL REFERENCES runs (run_id),
+    category          TEXT NOT NULL,
+    brand             TEXT NOT NULL,
+    full_title        TEXT NOT NULL,
+    display_title     TEXT NOT NULL,
+    price             REAL NOT NULL,
+    stock             INTEGER NOT NULL,
+    status            TEXT NOT NULL,
+    total_stock_value REAL NOT NULL,
+    PRIMARY KEY (product_id, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_snapshots_category ON snapshots (category, run_id);
+CREATE INDEX IF NOT EXISTS idx_snapshots_run ON snapshots (run_id);
+"""
+
+_COLUMNS = "s.product_id, s.display_title, s.full_title, s.brand, s.category, s.price, s.stock, s.status, s.total_stock_value"
+
+Row = Tuple[int, int, str, str, str, str, float, int, str, float]
+
+
+class SnapshotStore(ISnapshotStore):
+    """
+    Histórico local das saídas do DataService (SQLite).
+    Cada execução vira um run; cada produto processado vira uma linha
+    indexada por (produto, run), categoria e horário do run.
+    Permite consultar o último snapshot, o histórico de um produto e as
+    mudanças de status sem chamar a API de novo.
+    Mantém os BI_SNAPSHOT_KEEP runs mais recentes (0 = sem limite).
+    """
+
+    def __init__(self, path: str = None, keep: int = None):
+        self.path = path or os.getenv("BI_SNAPSHOT_DB", os.path.join("output", "bi_snapshots.db"))
+        self.keep = keep if keep is not None else int(os.getenv("BI_SNAPSHOT_KEEP", "1000"))
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Uma conexão compartilhada; o lock serializa o acesso entre threads
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+
+    # --- Gravação ---
+
+    def begin_run(self, pipeline: str = "adhoc") -> int:
+        run_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            cursor = self._conn.execute("INSERT INTO runs (run_at, pipeline) VALUES (?, ?)", (run_at, pipeline))
+            self._prune()
+        return cursor.lastrowid
+
+    def append(self, run_id: int, products) -> int:
+        """Acrescenta produtos limpos (lista de DTOs ou ProductColumns) a um run"""
+        rows = list(self._rows(run_id, products))
+        if not rows:
+            return 0
+        with self._lock, self._conn:
+            # Se o mesmo produto aparecer duas vezes no run, vale a última leitura
+            self._conn.executemany("INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.execute("UPDATE runs SET products = (SELECT COUNT(*) FROM snapshots WHERE run_id = ?) "
+                               "WHERE run_id = ?", (run_id, run_id))
+        return len(rows)
+
+    # --- Consultas ---
+
+    def latest_snapshot(self, category: str = None) -> List[CleanedProductDTO]:
+        """Última leitura conhecida de cada produto (runs parciais não apagam os demais)"""
+        sql = (f"SELECT {_COLUMNS} FROM snapshots s "
+               "JOIN (SELECT product_id, MAX(run_id) AS run_id FROM snapshots GROUP BY product_id) last "
+               "USING (product_id, run_id)")
+        params: tuple = ()
+        if category:
+            sql += " WHERE s.category = ?"
+            params = (category,)
+        return [self._to_dto(row) for row in self._query(sql + " ORDER BY s.product_id", params)]
+
+    def product_history(self, product_id: int, since: str = None) -> List[Tuple[str, CleanedProductDTO]]:
+        """(horário do run, leitura) de um produto, do mais antigo para o mais recente"""
+        sql = (f"SELECT r.run_at, {_COLUMNS} FROM snapshots s JOIN runs r USING (run_id) "
+               "WHERE s.product_id = ?")
+        params: tuple = (product_id,)
+        if since:
+            sql += " AND r.run_at >= ?"
+            params += (since,)
+        return [(row[0], self._to_dto(row[1:])) for row in self._query(sql + " ORDER BY s.run_id", params)]
+
+    def status_transitions(self, product_id: int = None, status: ProductStatus = None,
+                           since: str = None) -> List[Tuple[str, int, str, ProductStatus, ProductStatus]]:
+        """
+        Mudanças de status entre leituras consecutivas de cada produto:
+        (horário, id, título, status anterior, novo status).
+        status=ProductStatus.ESGOTADO responde "quando cada item esgotou".
+        """
+        filters, params = [], []
+        if product_id is not None:
+            filters.append("product_id = ?")
+            params.append(product_id)
+        where = f"WHERE {' AND '.join(filters)}" if filters else ""
+
+        outer, outer_params = ["previous IS NOT NULL", "status <> previous"], []
+        if status is not None:
+            outer.append("status = ?")
+            outer_params.append(ProductStatus(status).name)
+        if since:
+            outer.append("run_at >= ?")
+            outer_params.append(since)
+
+        sql = (
+            "SELECT run_at, product_id, full_title, previous, status FROM ("
+            "  SELECT r.run_at, s.run_id, s.product_id, s.full_title, s.status,"
+            "         LAG(s.status) OVER (PARTITION BY s.product_id ORDER BY s.run_id) AS previous"
+            f"  FROM snapshots s JOIN runs r USING (run_id) {where}"
+            f") WHERE {' AND '.join(outer)} ORDER BY run_id, product_id"
+        )
+        return [
+            (run_at, pid, title, ProductStatus[previous], ProductStatus[current])
+            for run_at, pid, title, previous, current in self._query(sql, tuple(params + outer_params))
+        ]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- Internos ---
+
+    def _prune(self):
+        """Apaga os runs além dos `keep` mais recentes (chamado com o lock e a transação abertos)"""
+        if self.keep <= 0:
+            return
+        cutoff = self._conn.execute("SELECT run_id FROM runs ORDER BY run_id DESC LIMIT 1 OFFSET ?",
+                                    (self.keep,)).fetchone()
+        if cutoff:
+            self._conn.execute("DELETE FROM snapshots WHERE run_id <= ?", cutoff)
+            self._conn.execute("DELETE FROM runs WHERE run_id <= ?", cutoff)
+
+    def _query(self, sql: str, params: tuple = ()) -> list:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _rows(run_id: int, products) -> Iterable[Row]:
+        if hasattr(products, "status_codes"):
+            # ProductColumns: lê as colunas direto, sem montar um DTO por linha
+            statuses = [_STATUS_ORDER[code].name for code in products.status_codes.tolist()]
+            return zip(
+                products.ids.tolist(), [run_id] * len(products), products.categories.tolist(),
+                products.brands.tolist(), products.full_titles.tolist(), products.display_titles.tolist(),
+                products.prices.tolist(), products.stocks.tolist(), statuses, products.total_stock_values.tolist(),
+            )
+        return (
+            (p.id, run_id, p.category, p.brand, p.full_title, p.display_title,
+             float(p.price), int(p.stock), _STATUS_BY_LABEL[p.status].name, float(p.total_stock_value))
+            for p in products
+        )
+
+    @staticmethod
+    def _to_dto(row) -> CleanedProductDTO:
+        pid, display_title, full_title, brand, category, price, stock, status, total_stock_value = row
+        return CleanedProductDTO(
+            id=pid, display_title=display_title, full_title=full_title, brand=brand, category=category,
+            price=price, stock=stock, status=ProductStatus[status].value.capitalize(),
+            total_stock_value=total_stock_value,
+        )
@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+class IArtifactCache(ABC):
+    @abstractmethod
+    def is_current(self, target: str, digest: str, path: str = None) -> bool:
+        """True se o último artefato/envio bem-sucedido do alvo tem esta impressão digital"""
+        pass
+
+    @abstractmethod
+    def mark(self, target: str, digest: str, path: str = None):
+        """Registra o artefato/envio bem-sucedido do alvo"""
+        pass
+
+    @abstractmethod
+    def forget(self, target: str):
+        """Descarta o registro do alvo (ele mudou por um caminho que não passa pelo cache)"""
+        pass
+
+    @abstractmethod
+    def lookup(self, digest: str) -> Optional[str]:
+        """Caminho do artefato guardado com esta impressão digital (ou None)"""
+        pass
+
+    @abstractmethod
+    def store(self, digest: str, source_path: str, kind: str, rows: int = 0) -> Optional[str]:
+        """Guarda uma cópia do artefato gerado, endereçada pelo conteúdo"""
+        pass
+
+    @abstractmethod
+    def restore(self, digest: str, dest_path: str) -> bool:
+        """Copia o artefato guardado para o destino, sem regerar nada"""
+        pass
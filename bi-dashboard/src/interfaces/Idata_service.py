@@ -1,9 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Dict
+from typing import Iterable, Iterator, List, Optional, Tuple, Dict
 from models.product_dto import ProductDTO
 from models.cleaned_product_dto import CleanedProductDTO
+from services.metrics_accumulator import MetricsAccumulator
 
 class IDataService(ABC):
+    # Motores que decodificam o JSON por conta própria pedem páginas brutas
+    # (IProductSource.iter_raw_pages) com este tamanho; None = páginas de ProductDTO
+    raw_page_size: Optional[int] = None
+
     @abstractmethod
     def prepare_products(self, raw_products: List[ProductDTO]) -> Tuple[List[CleanedProductDTO], Dict[str, int]]:
         """Aplica regras de negócio e retorna produtos limpos e estatísticas."""
@@ -11,5 +16,10 @@ class IDataService(ABC):
 
     @abstractmethod
     def get_dashboard_metrics(self, cleaned_products: List[CleanedProductDTO]) -> Dict[str, float]:
-        """Calcula métricas agregadas para o dashboard utilizando NumPy."""
-        pass
\ No newline at end of file
+        """Calcula métricas agregadas para o dashboard (via MetricsAccumulator)."""
+        pass
+
+    @abstractmethod
+    def prepare_stream(self, pages: Iterable[List[ProductDTO]], accumulator: MetricsAccumulator) -> Iterator[List[CleanedProductDTO]]:
+        """Transforma o catálogo bloco a bloco, acumulando estatísticas e métricas."""
+        pass
@@ -1,9 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterable, List
 from models.cleaned_product_dto import CleanedProductDTO
 
 class IExcelExporter(ABC):
     @abstractmethod
     def send_to_excel(self, products: List[CleanedProductDTO], filename: str) -> bool:
         """Contrato para exportação de dados para Excel"""
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def send_chunks_to_excel(self, chunks: Iterable[List[CleanedProductDTO]], filename: str) -> bool:
+        """Exportação em streaming: consome os produtos bloco a bloco"""
+        pass
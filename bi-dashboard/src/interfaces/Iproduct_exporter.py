@@ -1,9 +1,25 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import Iterable, List, Dict
 from models.cleaned_product_dto import CleanedProductDTO
+from services.metrics_accumulator import MetricsAccumulator
 
 class IProductExporter(ABC):
     @abstractmethod
     def send_to_rows(self, products: List[CleanedProductDTO], metrics: Dict[str, float]) -> bool:
         """Contrato obrigatório para envio de dados ao dashboard"""
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def sync_changes_to_rows(self, products: List[CleanedProductDTO], metrics: Dict[str, float]) -> bool:
+        """Envio incremental: apenas linhas alteradas, novas ou removidas desde o último envio"""
+        pass
+
+    @abstractmethod
+    def send_chunks_to_rows(self, chunks: Iterable[List[CleanedProductDTO]], accumulator: MetricsAccumulator) -> bool:
+        """Envio em streaming: blocos de produtos e rodapé com as métricas acumuladas"""
+        pass
+
+    @abstractmethod
+    def resume_failed_upload(self) -> bool:
+        """Reenvia os blocos que falharam no último envio em modo chunked"""
+        pass
@@ -1,9 +1,25 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, List, Optional, Union
 from models.product_dto import ProductDTO
 
 
 class IProductSource(ABC):
     @abstractmethod
     def fetch_products(self, limit: int, skip: int) -> List[ProductDTO]:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def iter_pages(self, page_size: int) -> Iterator[List[ProductDTO]]:
+        """Entrega o catálogo página a página, em ordem, buscando as próximas em paralelo (pipeline em streaming)."""
+        pass
+
+    @abstractmethod
+    def iter_raw_pages(self, page_size: int) -> Iterator[bytes]:
+        """Catálogo página a página como corpos JSON brutos, sem desserializar."""
+        pass
+
+    def pages(self, page_size: int, raw_page_size: Optional[int] = None) -> Iterator[Union[bytes, List[ProductDTO]]]:
+        """Catálogo completo para o streaming: corpos brutos se o motor os pede (IDataService.raw_page_size), senão DTOs."""
+        if raw_page_size:
+            return self.iter_raw_pages(page_size=raw_page_size)
+        return self.iter_pages(page_size=page_size)
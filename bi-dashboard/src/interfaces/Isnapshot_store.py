@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+from typing import List, Tuple
+from enums.product_status import ProductStatus
+from models.cleaned_product_dto import CleanedProductDTO
+
+class ISnapshotStore(ABC):
+    @abstractmethod
+    def begin_run(self, pipeline: str = "adhoc") -> int:
+        """Abre um novo run e retorna o seu id"""
+        pass
+
+    @abstractmethod
+    def append(self, run_id: int, products) -> int:
+        """Acrescenta produtos limpos ao run; retorna quantos foram gravados"""
+        pass
+
+    @abstractmethod
+    def latest_snapshot(self, category: str = None) -> List[CleanedProductDTO]:
+        """Última leitura conhecida de cada produto"""
+        pass
+
+    @abstractmethod
+    def product_history(self, product_id: int, since: str = None) -> List[Tuple[str, CleanedProductDTO]]:
+        """Leituras de um produto ao longo dos runs"""
+        pass
+
+    @abstractmethod
+    def status_transitions(self, product_id: int = None, status: ProductStatus = None,
+                           since: str = None) -> List[Tuple[str, int, str, ProductStatus, ProductStatus]]:
+        """Mudanças de status entre leituras consecutivas"""
+        pass
@@ -0,0 +1,7 @@
+from abc import ABC, abstractmethod
+
+class IStatusNotifier(ABC):
+    @abstractmethod
+    def update_status(self, mensagem: str, is_ok: bool = True) -> bool:
+        """Publica o status atual do pipeline no dashboard"""
+        pass
@@ -1,30 +1,158 @@
-from controllers.dummy_json_controller import DummyJsonController
-from controllers.notion_controller import NotionController
-from services.data_service import DataService
-from views.terminal_view import TerminalView
-from views.excel_view import ExcelView
-from views.rows_view import RowsView
-from data.excel_exporter import ExcelExporter
-from data.rows_exporter import RowsExporter
-
-def main():
+import argparse
+import logging
+import os
+import signal
+import sys
+from functools import cached_property
+from typing import Callable
+
+# Os módulos do pipeline (requests, pydantic, NumPy, openpyxl...) são importados
+# sob demanda dentro do App: cada comando carrega apenas o que usa.
+
+# comando -> (componente do App, método)
+COMMANDS = {
+    "report": ("t_view", "run_report"),
+    "report-full": ("t_view", "run_full_report"),
+    "excel": ("e_view", "run_export"),
+    "rows-sync": ("r_view", "run_rows_sync"),
+    "notion-ping": ("notion", "ping"),
+    "excel-stream": ("e_view", "run_streaming_export"),
+    "rows-stream": ("r_view", "run_streaming_rows_sync"),
+    "rows-resume": ("r_view", "run_resume_upload"),
+    "report-local": ("h_view", "run_local_report"),
+    "history": ("h_view", "run_history"),
+}
+
+class App:
+    """
+    Raiz de composição: cada peça é criada uma única vez, no primeiro uso,
+    e reaproveitada (menu, CLI e daemon).
+    """
+
     # --- 1. INSTANCIAÇÃO (CLASSES CONCRETAS) ---
     # Criamos as peças do "quebra-cabeça"
-    api = DummyJsonController()
-    service = DataService()
-    notion = NotionController()
-    
-    # Exporters (Implementam IProductExporter e IExcelExporter)
-    excel_exp = ExcelExporter()
-    rows_exp = RowsExporter(notion_controller=notion)
+
+    @cached_property
+    def instrumentation(self):
+        # Métricas por etapa: BI_LOG_LEVEL=INFO mostra o JSON, BI_METRICS_FILE grava o snapshot Prometheus
+        from services.instrumentation import Instrumentation
+        return Instrumentation()
+
+    @cached_property
+    def http(self):
+        # Uma única Session HTTP (pool keep-alive) compartilhada por todas as integrações
+        from data.http_session import create_http_session
+        return self.instrumentation.attach(create_http_session())
+
+    @cached_property
+    def source(self):
+        from controllers.dummy_json_controller import DummyJsonController
+        from controllers.cached_product_source import CachedProductSource
+        # O cache evita baixar de novo a mesma página entre relatório, Excel e Rows
+        return CachedProductSource(DummyJsonController(session=self.http))
+
+    @cached_property
+    def engine(self):
+        # BI_DATA_ENGINE=columnar ativa o motor vetorizado (catálogos grandes)
+        # BI_DATA_ENGINE=process distribui o motor vetorizado entre processos (milhões de itens)
+        engine = os.getenv("BI_DATA_ENGINE")
+        if engine == "process":
+            from services.process_pool_data_service import ProcessPoolDataService
+            return ProcessPoolDataService()
+        if engine == "columnar":
+            from services.columnar_data_service import ColumnarDataService
+            return ColumnarDataService()
+        from services.data_service import DataService
+        return DataService()
+
+    @cached_property
+    def service(self):
+        # Toda saída do tratamento vai para o histórico local (BI_SNAPSHOTS=0 desliga)
+        if os.getenv("BI_SNAPSHOTS", "1") == "0":
+            return self.engine
+        from services.snapshot_data_service import SnapshotDataService
+        return SnapshotDataService(self.engine, self.store)
+
+    @cached_property
+    def store(self):
+        from data.snapshot_store import SnapshotStore
+        return SnapshotStore()
+
+    @cached_property
+    def artifacts(self):
+        # Cache de artefatos por impressão digital (BI_ARTIFACT_CACHE=0 desliga)
+        if os.getenv("BI_ARTIFACT_CACHE", "1") == "0":
+            return None
+        from data.artifact_cache import ArtifactCache
+        return ArtifactCache()
+
+    @cached_property
+    def notion(self):
+        from controllers.notion_controller import NotionController
+        return NotionController(session=self.http)
+
+    @cached_property
+    def notion_publisher(self):
+        # Status do pipeline vai para o Notion em segundo plano (nunca bloqueia o sync)
+        from controllers.notion_status_publisher import NotionStatusPublisher
+        return NotionStatusPublisher(self.notion, instrumentation=self.instrumentation)
 
     # --- 2. INJEÇÃO DE DEPENDÊNCIA (VIEWS) ---
-    # As Views agora recebem as interfaces no construtor
-    # Isso elimina a necessidade de passar 'api' ou 'service' em cada método
-    t_view = TerminalView(source=api, service=service)
-    e_view = ExcelView(source=api, service=service, exporter=excel_exp)
-    r_view = RowsView(source=api, service=service, exporter=rows_exp)
+    # As Views recebem as interfaces no construtor
+
+    @cached_property
+    def t_view(self):
+        from views.terminal_view import TerminalView
+        return TerminalView(source=self.source, service=self.service, instrumentation=self.instrumentation)
+
+    @cached_property
+    def e_view(self):
+        from views.excel_view import ExcelView
+        from data.excel_exporter import ExcelExporter
+        exporter = ExcelExporter()
+        if self.artifacts is not None:
+            # Dados inalterados: o relatório sai do cache em vez de ser regerado
+            from data.cached_excel_exporter import CachedExcelExporter
+            exporter = CachedExcelExporter(exporter, self.artifacts)
+        # BI_EXPORT_FILENAME=relatorio_adm.csv / .parquet troca o formato do relatório
+        return ExcelView(source=self.source, service=self.service, exporter=exporter,
+                         filename=os.getenv("BI_EXPORT_FILENAME", "relatorio_adm.xlsx"),
+                         instrumentation=self.instrumentation)
+
+    @cached_property
+    def r_view(self):
+        from views.rows_view import RowsView
+        from data.rows_exporter import RowsExporter
+        rows_exp = RowsExporter(notion_controller=self.notion_publisher, session=self.http)
+        if self.artifacts is not None:
+            # Mesma impressão digital do último envio: nada a enviar
+            from data.cached_rows_exporter import CachedRowsExporter
+            rows_exp = CachedRowsExporter(rows_exp, self.artifacts)
+        return RowsView(source=self.source, service=self.service, exporter=rows_exp,
+                        instrumentation=self.instrumentation)
+
+    @cached_property
+    def h_view(self):
+        from views.history_view import HistoryView
+        return HistoryView(store=self.store)
+
+    def resolve(self, command: str) -> Callable[[], bool]:
+        """Monta (sem executar) o que o comando precisa e devolve a ação"""
+        owner, method = COMMANDS[command]
+        return getattr(getattr(self, owner), method)
+
+    def close(self):
+        # Só encerra o publisher se ele chegou a ser criado
+        if "notion_publisher" in self.__dict__:
+            self.notion_publisher.close()
+        if "store" in self.__dict__:
+            self.store.close()
+        # Encerra o pool de processos do motor, se houver
+        if hasattr(self.__dict__.get("engine"), "close"):
+            self.engine.close()
 
+
+def run_menu(app: App):
     # --- 3. INTERFACE DE USUÁRIO ---
     print(f"\n" + "="*50)
     print(f" SISTEMA GREG COMPANY | GESTAO ADMINISTRATIVA ".center(50, "="))
@@ -33,25 +161,117 @@ def main():
     print("2. Gerar Planilha Excel (OneDrive Fatec)")
     print("3. Sincronizar Dashboard Notion (Rows.com)")
     print("4. Testar Conexão API Notion (Apenas Status)")
+    print("5. Exportar Catálogo Completo para Excel (Streaming)")
+    print("6. Sincronizar Catálogo Completo com Rows.com (Streaming)")
+    print("7. Reenviar Blocos Pendentes para o Rows.com")
+    print("8. Relatório do Histórico Local (sem API)")
+    print("9. Relatório no Terminal (Catálogo Completo)")
     print("0. Sair")
-    
+
+    opcoes = {
+        "1": "report", "2": "excel", "3": "rows-sync", "4": "notion-ping",
+        "5": "excel-stream", "6": "rows-stream", "7": "rows-resume", "8": "report-local",
+        "9": "report-full",
+    }
+
     while True:
         escolha = input("\nO que deseja fazer? ")
 
-        if escolha == "1":
-            t_view.run_report() # Método agora é limpo, sem parâmetros
-        elif escolha == "2":
-            e_view.run_export() # As dependências já estão "dentro" da view
-        elif escolha == "3":
-            r_view.run_rows_sync()
-        elif escolha == "4":
-            print("Enviando sinal de teste para o Notion...")
-            notion.update_status("Teste de API realizado com sucesso!", is_ok=True)
+        if escolha in opcoes:
+            app.resolve(opcoes[escolha])()
         elif escolha == "0":
             print("Encerrando sistema...")
             break
         else:
             print("❌ Opção inválida!")
 
+
+def run_daemon(app: App, jobs, interval: float, jitter: float, max_backoff: float):
+    from services.pipeline_scheduler import PipelineScheduler
+    scheduler = PipelineScheduler(
+        jobs={name: app.resolve(name) for name in jobs},
+        interval=interval, jitter=jitter, max_backoff=max_backoff,
+    )
+    # docker stop / Ctrl+C encerram o ciclo atual e saem sem deixar status pendente
+    signal.signal(signal.SIGTERM, lambda *_: scheduler.stop())
+    print(f"[DAEMON] Iniciado: {', '.join(jobs)} a cada {interval:.0f}s (jitter {jitter:.0%})")
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        scheduler.stop()
+    print("[DAEMON] Encerrado.")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Greg Company | Motor de BI")
+    sub = parser.add_subparsers(dest="command")
+
+    for name, help_text in (("report", "Relatório de inventário no terminal"),
+                            ("report-full", "Relatório de inventário do catálogo completo")):
+        report = sub.add_parser(name, help=help_text)
+        if name == "report":
+            report.add_argument("--pages", type=int, help="Quantidade de páginas (0 = catálogo completo)")
+        report.add_argument("--page-size", type=int, help="Produtos por página")
+        report.add_argument("--output", help="Grava o relatório neste arquivo em vez do terminal")
+    sub.add_parser("excel", help="Gera o relatório administrativo (xlsx/csv/parquet)")
+    sub.add_parser("rows-sync", help="Sincroniza o dashboard do Rows.com (incremental)")
+    sub.add_parser("notion-ping", help="Envia um status de teste para o Notion")
+    sub.add_parser("excel-stream", help="Exporta o catálogo completo em streaming")
+    sub.add_parser("rows-stream", help="Sincroniza o catálogo completo em streaming")
+    sub.add_parser("rows-resume", help="Reenvia blocos pendentes para o Rows.com")
+    sub.add_parser("report-local", help="Último snapshot do histórico local, sem chamar a API")
+
+    history = sub.add_parser("history", help="Histórico local: um produto ou as mudanças de status")
+    history.add_argument("--product", type=int, help="ID do produto")
+    history.add_argument("--status", help="Filtra mudanças para este status (ex.: ESGOTADO)")
+
+    daemon = sub.add_parser("daemon", help="Executa os pipelines em intervalo fixo")
+    daemon.add_argument("--jobs", default=os.getenv("BI_DAEMON_JOBS", "rows-sync"),
+                        help="Comandos separados por vírgula (padrão: rows-sync)")
+    daemon.add_argument("--interval", type=float, default=float(os.getenv("BI_DAEMON_INTERVAL", "900")),
+                        help="Intervalo entre execuções, em segundos")
+    daemon.add_argument("--jitter", type=float, default=float(os.getenv("BI_DAEMON_JITTER", "0.1")),
+                        help="Variação aleatória do intervalo (0.1 = ±10%%)")
+    daemon.add_argument("--max-backoff", type=float, default=float(os.getenv("BI_DAEMON_MAX_BACKOFF", "3600")),
+                        help="Espera máxima após falhas seguidas, em segundos")
+    return parser
+
+
+def main(argv=None) -> int:
+    # .env carregado uma única vez, antes do parser (padrões BI_DAEMON_*) e de qualquer componente
+    from dotenv import load_dotenv
+    load_dotenv()
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=os.getenv("BI_LOG_LEVEL", "WARNING").upper(), format="%(message)s")
+
+    app = App()
+    try:
+        if args.command is None:
+            run_menu(app)
+            return 0
+
+        if args.command == "daemon":
+            jobs = [j.strip() for j in args.jobs.split(",") if j.strip()]
+            invalid = [j for j in jobs if j not in COMMANDS]
+            if invalid:
+                print(f"❌ Comandos inválidos para o daemon: {', '.join(invalid)}")
+                return 2
+            run_daemon(app, jobs, args.interval, args.jitter, args.max_backoff)
+            return 0
+
+        if args.command == "history":
+            return 0 if app.resolve("history")(product_id=args.product, status=args.status) else 1
+
+        if args.command == "report":
+            ok = app.resolve("report")(total_pages=args.pages, page_size=args.page_size, output=args.output)
+            return 0 if ok else 1
+
+        if args.command == "report-full":
+            return 0 if app.resolve("report-full")(page_size=args.page_size, output=args.output) else 1
+
+        return 0 if app.resolve(args.command)() else 1
+    finally:
+        app.close()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from enums.product_status import ProductStatus
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CleanedProductDTO:
     """DTO para dados processados e prontos para o Dashboard"""
     id: int
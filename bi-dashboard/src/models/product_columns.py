@@ -0,0 +1,252 @@
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Sequence, Set
+import numpy as np
+from enums.product_status import ProductStatus
+from models.cleaned_product_dto import CleanedProductDTO
+
+# Ordem dos códigos de status: o índice no array é o código gravado em status_codes
+STATUS_ORDER: List[ProductStatus] = list(ProductStatus)
+# Rótulo exibido, igual ao gerado pelo DataService (status.value.capitalize())
+STATUS_LABELS = np.array([s.value.capitalize() for s in STATUS_ORDER], dtype=np.dtypes.StringDType())
+_STATUS_LABELS_PY = STATUS_LABELS.tolist()
+
+# Mesma regra do DataService para o título curto
+TITLE_LIMIT = 20
+
+
+def display_title(full_title: str) -> str:
+    return full_title[:TITLE_LIMIT] + "..." if len(full_title) > TITLE_LIMIT else full_title
+
+
+def code_dtype(table_size: int):
+    """Menor inteiro que comporta os códigos de uma tabela de dicionário"""
+    return np.int8 if table_size <= 127 else np.int16 if table_size <= 32767 else np.int32
+
+
+@dataclass(frozen=True, eq=False)
+class ProductColumns:
+    """
+    Produtos limpos em formato colunar compacto: números em arrays tipados,
+    categoria/marca/status como códigos inteiros pequenos + tabela de valores,
+    títulos num único buffer UTF-8 com offsets (como no Arrow) e o título
+    curto gerado sob demanda a partir do título completo.
+    Se comporta como uma sequência de CleanedProductDTO para as views
+    (linhas leves, ver ProductRow), mas métricas e exportações leem as colunas.
+    """
+    ids: np.ndarray
+    title_data: bytes
+    title_offsets: np.ndarray
+    prices: np.ndarray
+    stocks: np.ndarray
+    status_codes: np.ndarray
+    category_codes: np.ndarray
+    category_table: np.ndarray
+    brand_codes: np.ndarray
+    brand_table: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "ProductColumns":
+        no_codes = np.zeros(0, dtype=np.int8)
+        return cls(
+            ids=np.zeros(0, dtype=np.int32), title_data=b"", title_offsets=np.zeros(1, dtype=np.int64),
+            prices=np.zeros(0, dtype=np.float64), stocks=np.zeros(0, dtype=np.int32), status_codes=no_codes,
+            category_codes=no_codes, category_table=np.array([], dtype=np.dtypes.StringDType()),
+            brand_codes=no_codes, brand_table=np.array([], dtype=np.dtypes.StringDType()),
+        )
+
+    @classmethod
+    def concat(cls, parts: Sequence["ProductColumns"]) -> "ProductColumns":
+        """Junta blocos (ex.: um por worker), unificando as tabelas de categoria e marca"""
+        filled = [p for p in parts if len(p)]
+        if len(filled) <= 1:
+            return filled[0] if filled else parts[0] if parts else cls.empty()
+
+        def merge_codes(codes_attr: str, table_attr: str):
+            table: Dict[str, int] = {}
+            remapped = []
+            for p in filled:
+                # Código local -> código global: só percorre a tabela (valores distintos)
+                mapping = np.array([table.setdefault(v, len(table)) for v in getattr(p, table_attr).tolist()], dtype=np.int32)
+                remapped.append(mapping[getattr(p, codes_attr)])
+            return np.concatenate(remapped).astype(code_dtype(len(table))), np.array(list(table), dtype=np.dtypes.StringDType())
+
+        offsets, base = [np.zeros(1, dtype=np.int64)], 0
+        for p in filled:
+            offsets.append(p.title_offsets[1:] + base)
+            base += len(p.title_data)
+
+        category_codes, category_table = merge_codes("category_codes", "category_table")
+        brand_codes, brand_table = merge_codes("brand_codes", "brand_table")
+        return cls(
+            ids=np.concatenate([p.ids for p in filled]),
+            title_data=b"".join(p.title_data for p in filled),
+            title_offsets=np.concatenate(offsets),
+            prices=np.concatenate([p.prices for p in filled]),
+            stocks=np.concatenate([p.stocks for p in filled]),
+            status_codes=np.concatenate([p.status_codes for p in filled]),
+            category_codes=category_codes,
+            category_table=category_table,
+            brand_codes=brand_codes,
+            brand_table=brand_table,
+        )
+
+    # --- Colunas derivadas (decodificadas só quando alguém pede) ---
+
+    @property
+    def full_titles(self) -> np.ndarray:
+        return np.array(self.title_list(), dtype=np.dtypes.StringDType())
+
+    def title_list(self) -> List[str]:
+        data, offsets = self.title_data, self.title_offsets.tolist()
+        return [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+    def title(self, index: int) -> str:
+        start, end = self.title_offsets[index:index + 2].tolist()
+        return self.title_data[start:end].decode("utf-8")
+
+    @property
+    def statuses(self) -> np.ndarray:
+        return STATUS_LABELS[self.status_codes]
+
+    @property
+    def categories(self) -> np.ndarray:
+        return self.category_table[self.category_codes]
+
+    @property
+    def brands(self) -> np.ndarray:
+        return self.brand_table[self.brand_codes]
+
+    @property
+    def display_titles(self) -> np.ndarray:
+        return np.array([display_title(t) for t in self.title_list()], dtype=np.dtypes.StringDType())
+
+    @property
+    def total_stock_values(self) -> np.ndarray:
+        return self.prices * self.stocks
+
+    def unique_categories(self) -> Set[str]:
+        return {self.category_table[c] for c in np.unique(self.category_codes).tolist()}
+
+    @property
+    def nbytes(self) -> int:
+        """Memória aproximada da tabela (buffers dos arrays + texto)"""
+        tables = sum(len(t.encode("utf-8")) for t in self.category_table.tolist() + self.brand_table.tolist())
+        arrays = (self.ids, self.title_offsets, self.prices, self.stocks, self.status_codes,
+                  self.category_codes, self.brand_codes, self.category_table, self.brand_table)
+        return sum(a.nbytes for a in arrays) + len(self.title_data) + tables
+
+    # --- Sequência de linhas ---
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __bool__(self) -> bool:
+        return len(self.ids) > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._slice(index)
+        if index < 0:
+            index += len(self.ids)
+        if not 0 <= index < len(self.ids):
+            raise IndexError(index)
+        return ProductRow(self, index)
+
+    def _slice(self, index: slice) -> "ProductColumns":
+        """Fatia como outra ProductColumns (mesmas tabelas de categoria/marca)"""
+        start, stop, step = index.indices(len(self.ids))
+        if step == 1:
+            # Fatia contígua: um pedaço do buffer de títulos, offsets rebaseados
+            stop = max(start, stop)
+            offsets = self.title_offsets[start:stop + 1]
+            title_data = self.title_data[int(offsets[0]):int(offsets[-1])]
+            offsets = offsets - offsets[0]
+        else:
+            titles = [self.title(i) for i in range(start, stop, step)]
+            encoded = [t.encode("utf-8") for t in titles]
+            offsets = np.zeros(len(encoded) + 1, dtype=self.title_offsets.dtype)
+            np.cumsum([len(t) for t in encoded], out=offsets[1:])
+            title_data = b"".join(encoded)
+        return ProductColumns(
+            ids=self.ids[index],
+            title_data=title_data,
+            title_offsets=offsets,
+            prices=self.prices[index],
+            stocks=self.stocks[index],
+            status_codes=self.status_codes[index],
+            category_codes=self.category_codes[index],
+            category_table=self.category_table,
+            brand_codes=self.brand_codes[index],
+            brand_table=self.brand_table,
+        )
+
+    def __iter__(self) -> Iterator["ProductRow"]:
+        for i in range(len(self.ids)):
+            yield ProductRow(self, i)
+
+
+class ProductRow:
+    """
+    Visão de uma linha da ProductColumns com os mesmos atributos do
+    CleanedProductDTO. Guarda só a tabela e o índice: nada é copiado.
+    """
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: ProductColumns, index: int):
+        self._table = table
+        self._index = index
+
+    @property
+    def id(self) -> int:
+        return int(self._table.ids[self._index])
+
+    @property
+    def full_title(self) -> str:
+        return self._table.title(self._index)
+
+    @property
+    def display_title(self) -> str:
+        return display_title(self.full_title)
+
+    @property
+    def brand(self) -> str:
+        t = self._table
+        return str(t.brand_table[t.brand_codes[self._index]])
+
+    @property
+    def category(self) -> str:
+        t = self._table
+        return str(t.category_table[t.category_codes[self._index]])
+
+    @property
+    def price(self) -> float:
+        return float(self._table.prices[self._index])
+
+    @property
+    def stock(self) -> int:
+        return int(self._table.stocks[self._index])
+
+    @property
+    def status(self) -> str:
+        return _STATUS_LABELS_PY[self._table.status_codes[self._index]]
+
+    @property
+    def total_stock_value(self) -> float:
+        return self.price * self.stock
+
+    def to_dto(self) -> CleanedProductDTO:
+        return CleanedProductDTO(
+            id=self.id, display_title=self.display_title, full_title=self.full_title,
+            brand=self.brand, category=self.category, price=self.price, stock=self.stock,
+            status=self.status, total_stock_value=self.total_stock_value,
+        )
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ProductRow):
+            other = other.to_dto()
+        return self.to_dto() == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(self.to_dto()).replace("CleanedProductDTO", "ProductRow", 1)
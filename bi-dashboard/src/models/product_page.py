@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+from typing import List, Optional
+from models.product_dto import ProductDTO
+
+@dataclass
+class ProductPage:
+    """Uma página da API de produtos, com o 'total' informado pela fonte"""
+    products: List[ProductDTO]
+    total: int
+    skip: int = 0
+    limit: int = 0
+    # Validadores HTTP para requisições condicionais (If-None-Match / If-Modified-Since)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+
@@ -0,0 +1,13 @@
+from typing import List, Optional
+from pydantic import BaseModel, TypeAdapter
+from models.product_dto import ProductDTO
+
+class ProductsResponseDTO(BaseModel):
+    """Envelope da API de produtos: {"products": [...], "total": 100, ...}"""
+    products: List[ProductDTO] = []
+    total: Optional[int] = None
+
+
+# Adapters construídos uma única vez: montar o validador é a parte cara
+PRODUCTS_RESPONSE_ADAPTER = TypeAdapter(ProductsResponseDTO)
+PRODUCT_LIST_ADAPTER = TypeAdapter(List[ProductDTO])
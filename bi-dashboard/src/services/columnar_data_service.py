@@ -0,0 +1,102 @@
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+import numpy as np
+from models.product_dto import ProductDTO
+from models.product_columns import ProductColumns, STATUS_ORDER, code_dtype
+from interfaces.Idata_service import IDataService
+from enums.product_status import ProductStatus
+from services.metrics_accumulator import MetricsAccumulator
+
+_STR = np.dtypes.StringDType()
+
+
+def _encode(values: Iterable[str], n: int) -> Tuple[np.ndarray, List[str]]:
+    """Codificação por dicionário: (códigos inteiros, tabela com cada valor distinto uma vez)"""
+    table: Dict[str, int] = {}
+    codes = np.fromiter((table.setdefault(v, len(table)) for v in values), dtype=np.int32, count=n)
+    return codes.astype(code_dtype(len(table))), list(table)
+
+class ColumnarDataService(IDataService):
+    """
+    Versão vetorizada do DataService: o JSON bruto vira colunas NumPy e
+    as regras de negócio rodam como operações sobre a coluna inteira.
+    Aceita List[ProductDTO], a lista de dicts do JSON ou, no streaming, os
+    corpos brutos da API (raw_page_size), sem passar por ProductDTO.
+    """
+
+    def __init__(self, raw_page_size: int = None):
+        # Streaming: páginas JSON brutas (IProductSource.iter_raw_pages) viram colunas direto
+        self.raw_page_size = raw_page_size if raw_page_size is not None else int(os.getenv("BI_TRANSFORM_PAGE_SIZE", "1000"))
+
+    def prepare_products(self, raw_products: Sequence[Union[ProductDTO, Dict[str, Any]]]) -> Tuple[ProductColumns, dict]:
+        if raw_products and isinstance(raw_products[0], ProductDTO):
+            records = [p.model_dump() for p in raw_products]
+        else:
+            records = list(raw_products)
+        return self.prepare_records(records)
+
+    def prepare_json(self, payload: bytes) -> Tuple[ProductColumns, dict]:
+        """Corpo JSON bruto -> colunas (o envelope da API ou só a lista de produtos)"""
+        data = json.loads(payload)
+        records = data.get("products", []) if isinstance(data, dict) else data
+        return self.prepare_records(records)
+
+    def prepare_records(self, records: List[Dict[str, Any]]) -> Tuple[ProductColumns, dict]:
+        n = len(records)
+
+        # 1. JSON -> colunas (uma única passada por campo)
+        ids = np.fromiter((r["id"] for r in records), dtype=np.int64, count=n)
+        prices = np.fromiter((r["price"] for r in records), dtype=np.float64, count=n)
+        stocks = np.fromiter((r["stock"] for r in records), dtype=np.int64, count=n)
+        # Títulos: um buffer UTF-8 + offsets, em vez de um objeto string por produto
+        encoded = [(r.get("title") or "Sem Nome").encode("utf-8") for r in records]
+        title_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=n), out=title_offsets[1:])
+        # Categoria e marca se repetem muito: códigos pequenos + tabela de valores
+        category_codes, raw_categories = _encode((r.get("category") or "" for r in records), n)
+        brand_codes, brands = _encode((r.get("brand") or "S/ Marca" for r in records), n)
+
+        # 2. Classificação de estoque (mesmos limites 0/10/20 do DataService)
+        ok, repor, critico, esgotado = (STATUS_ORDER.index(s) for s in (
+            ProductStatus.OK, ProductStatus.REPOR, ProductStatus.CRITICO, ProductStatus.ESGOTADO))
+        status_codes = np.select(
+            [stocks == 0, stocks < 10, stocks < 20],
+            [esgotado, critico, repor],
+            default=ok,
+        ).astype(np.int8)
+
+        # 3. Regras de texto aplicadas só na tabela de categorias (uma vez por valor distinto)
+        categories = [c.capitalize() if c else "Geral" for c in raw_categories]
+
+        columns = ProductColumns(
+            ids=ids.astype(np.int32) if n and ids.max() < 2**31 else ids,
+            title_data=b"".join(encoded),
+            title_offsets=title_offsets,
+            prices=prices,
+            stocks=stocks.astype(np.int32) if n and stocks.max() < 2**31 else stocks,
+            status_codes=status_codes,
+            category_codes=category_codes,
+            category_table=np.array(categories, dtype=_STR),
+            brand_codes=brand_codes,
+            brand_table=np.array(brands, dtype=_STR),
+        )
+
+        # 4. Estatísticas: contagem por status em uma única chamada
+        counts = np.bincount(status_codes, minlength=len(STATUS_ORDER))
+        stats = {status.value: int(counts[i]) for i, status in enumerate(STATUS_ORDER)}
+        stats["total"] = n
+        return columns, stats
+
+    def prepare_stream(self, pages: Iterable[Union[bytes, Sequence[Union[ProductDTO, Dict[str, Any]]]]], accumulator: MetricsAccumulator) -> Iterator[ProductColumns]:
+        for page in pages:
+            if isinstance(page, (bytes, bytearray)):
+                clean_chunk, stats = self.prepare_json(page)
+            else:
+                clean_chunk, stats = self.prepare_products(page)
+            accumulator.add(clean_chunk, stats)
+            yield clean_chunk
+
+    def get_dashboard_metrics(self, cleaned_products: ProductColumns) -> dict:
+        # Colunas ou lista de CleanedProductDTO vinda de outro serviço: o acumulador trata as duas
+        return MetricsAccumulator().add(cleaned_products).metrics()
@@ -1,9 +1,9 @@
-from typing import List, Tuple
-import numpy as np
+from typing import Iterable, Iterator, List, Tuple
 from models.product_dto import ProductDTO
 from models.cleaned_product_dto import CleanedProductDTO
 from interfaces.Idata_service import IDataService
 from enums.product_status import ProductStatus
+from services.metrics_accumulator import MetricsAccumulator
 
 class DataService(IDataService):
     def prepare_products(self, raw_products: List[ProductDTO]) -> Tuple[List[CleanedProductDTO], dict]:
@@ -40,13 +40,12 @@ class DataService(IDataService):
             
         return cleaned_data, stats
 
-    def get_dashboard_metrics(self, cleaned_products: List[CleanedProductDTO]) -> dict:
-        precos = np.array([p.price for p in cleaned_products])
-        estoques = np.array([p.stock for p in cleaned_products])
-        status_array = np.array([p.status for p in cleaned_products])
+    def prepare_stream(self, pages: Iterable[List[ProductDTO]], accumulator: MetricsAccumulator) -> Iterator[List[CleanedProductDTO]]:
+        for page in pages:
+            clean_chunk, stats = self.prepare_products(page)
+            accumulator.add(clean_chunk, stats)
+            yield clean_chunk
 
-        return {
-            "total_value": float(np.sum(precos * estoques)),
-            "critical_alerts": int(np.sum(np.char.find(status_array, "⚠️") != -1)),
-            "unique_categories": len(np.unique([p.category for p in cleaned_products]))
-        }
+    def get_dashboard_metrics(self, cleaned_products: List[CleanedProductDTO]) -> dict:
+        # Uma passada só, sem montar arrays: o status vem do enum, não de busca em texto
+        return MetricsAccumulator().add(cleaned_products).metrics()
@@ -0,0 +1,218 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger("bi.metrics")
+
+STAGES = ("extract", "transform", "metrics", "load", "notify")
+
+
+@dataclass
+class StageMetrics:
+    """Números de uma etapa dentro de uma execução de pipeline"""
+    pipeline: str
+    stage: str
+    seconds: float = 0.0
+    items: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    requests: int = 0
+    retries: int = 0
+    errors: int = 0
+
+
+class _Frame:
+    """Etapa ativa: o tempo gasto em etapas aninhadas é descontado (tempo exclusivo)"""
+    __slots__ = ("metrics", "child_seconds")
+
+    def __init__(self, metrics: StageMetrics):
+        self.metrics = metrics
+        self.child_seconds = 0.0
+
+
+_current_run: ContextVar[Optional[Dict[str, StageMetrics]]] = ContextVar("bi_current_run", default=None)
+_current_frame: ContextVar[Optional[_Frame]] = ContextVar("bi_current_frame", default=None)
+_RUN_NAME: ContextVar[str] = ContextVar("bi_run_name", default="adhoc")
+
+
+def current_pipeline() -> str:
+    """Nome do pipeline em execução no contexto atual ('adhoc' fora de um run)"""
+    return _RUN_NAME.get()
+
+
+def current_run() -> Optional[Dict[str, StageMetrics]]:
+    """Etapas do run ativo no contexto atual (None fora de um run): identifica uma execução do pipeline"""
+    return _current_run.get()
+
+
+class Instrumentation:
+    """
+    Métricas por etapa do ETL (extract, transform, metrics, load, notify):
+    tempo de parede, itens, bytes enviados/recebidos, requisições e retries.
+    Cada execução sai como linhas JSON no logger 'bi.metrics' (nível INFO) e
+    os totais acumulados ficam disponíveis em formato texto do Prometheus.
+    O contexto da etapa atual vive em ContextVars: pools de threads devem
+    submeter tarefas com contextvars.copy_context().run para herdá-lo.
+    """
+
+    def __init__(self, snapshot_path: str = None):
+        self.snapshot_path = snapshot_path or os.getenv("BI_METRICS_FILE")
+        self._totals: Dict[Tuple[str, str], StageMetrics] = {}
+        self._runs: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    # --- Execuções e etapas ---
+
+    @contextmanager
+    def run(self, pipeline: str) -> Iterator[Dict[str, StageMetrics]]:
+        stages: Dict[str, StageMetrics] = {}
+        token = _current_run.set(stages)
+        run_token = _RUN_NAME.set(pipeline)
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield stages
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            _RUN_NAME.reset(run_token)
+            _current_run.reset(token)
+            self._finish_run(pipeline, stages, time.perf_counter() - started, failed)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageMetrics]:
+        metrics = self._stage_metrics(name)
+        with self._timed(metrics):
+            try:
+                yield metrics
+            except BaseException:
+                metrics.errors += 1
+                raise
+
+    def timed_iter(self, name: str, iterable: Iterable) -> Iterator:
+        """Mede só o tempo gasto dentro de next() (etapas em streaming) e conta os itens"""
+        metrics = self._stage_metrics(name)
+        iterator = iter(iterable)
+        while True:
+            with self._timed(metrics):
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    return
+            # Corpos JSON brutos (bytes) não contam como itens: o tamanho deles já entra em bytes_received
+            if not isinstance(chunk, (bytes, bytearray)):
+                metrics.items += len(chunk)
+            yield chunk
+
+    def on_response(self, response, *args, **kwargs):
+        """Hook do requests: atribui bytes e retries à etapa ativa"""
+        frame = _current_frame.get()
+        if frame is None:
+            return response
+
+        body = response.request.body
+        sent = len(body) if body else 0
+        received = int(response.headers.get("Content-Length") or len(response.content))
+        retries = getattr(getattr(response.raw, "retries", None), "history", ()) or ()
+
+        with self._lock:
+            metrics = frame.metrics
+            metrics.requests += 1
+            metrics.bytes_sent += sent
+            metrics.bytes_received += received
+            metrics.retries += len(retries)
+            if response.status_code >= 400:
+                metrics.errors += 1
+        return response
+
+    def attach(self, session):
+        session.hooks["response"].append(self.on_response)
+        return session
+
+    # --- Exportação ---
+
+    def prometheus_text(self) -> str:
+        series = [
+            ("bi_stage_seconds_total", "Tempo de parede acumulado por etapa", "seconds"),
+            ("bi_stage_items_total", "Itens processados por etapa", "items"),
+            ("bi_stage_bytes_sent_total", "Bytes enviados por etapa", "bytes_sent"),
+            ("bi_stage_bytes_received_total", "Bytes recebidos por etapa", "bytes_received"),
+            ("bi_stage_requests_total", "Requisições HTTP por etapa", "requests"),
+            ("bi_stage_retries_total", "Retries HTTP por etapa", "retries"),
+            ("bi_stage_errors_total", "Erros por etapa", "errors"),
+        ]
+        with self._lock:
+            totals = sorted(self._totals.items())
+            runs = sorted(self._runs.items())
+
+        lines = []
+        for metric, help_text, field in series:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for (pipeline, stage), m in totals:
+                lines.append(f'{metric}{{pipeline="{pipeline}",stage="{stage}"}} {getattr(m, field)}')
+        lines.append("# HELP bi_pipeline_runs_total Execuções por pipeline")
+        lines.append("# TYPE bi_pipeline_runs_total counter")
+        for pipeline, count in runs:
+            lines.append(f'bi_pipeline_runs_total{{pipeline="{pipeline}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write_snapshot(self, path: str = None):
+        path = path or self.snapshot_path
+        if not path:
+            return
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+    # --- Internos ---
+
+    def _stage_metrics(self, name: str) -> StageMetrics:
+        stages = _current_run.get()
+        if stages is None:
+            # Etapa fora de um run(): vira um pipeline avulso com o próprio nome
+            stages = {}
+        if name not in stages:
+            stages[name] = StageMetrics(pipeline=_RUN_NAME.get(), stage=name)
+        return stages[name]
+
+    @contextmanager
+    def _timed(self, metrics: StageMetrics):
+        frame = _Frame(metrics)
+        parent = _current_frame.get()
+        token = _current_frame.set(frame)
+        started = time.perf_counter()
+        try:
+            yield frame
+        finally:
+            elapsed = time.perf_counter() - started
+            _current_frame.reset(token)
+            metrics.seconds += elapsed - frame.child_seconds
+            if parent is not None:
+                parent.child_seconds += elapsed
+
+    def _finish_run(self, pipeline: str, stages: Dict[str, StageMetrics], seconds: float, failed: bool):
+        with self._lock:
+            self._runs[pipeline] = self._runs.get(pipeline, 0) + 1
+            for m in stages.values():
+                total = self._totals.setdefault((pipeline, m.stage), StageMetrics(pipeline=pipeline, stage=m.stage))
+                for field in ("seconds", "items", "bytes_sent", "bytes_received", "requests", "retries", "errors"):
+                    setattr(total, field, getattr(total, field) + getattr(m, field))
+
+        if logger.isEnabledFor(logging.INFO):
+            for m in stages.values():
+                logger.info(json.dumps({"event": "stage", **asdict(m)}, ensure_ascii=False))
+            logger.info(json.dumps({"event": "run", "pipeline": pipeline, "seconds": round(seconds, 6),
+                                    "failed": failed}, ensure_ascii=False))
+        try:
+            self.write_snapshot()
+        except OSError as e:
+            logger.warning("Não foi possível gravar o snapshot de métricas: %s", e)
@@ -0,0 +1,85 @@
+from typing import Dict, Optional, Set
+from enums.product_status import ProductStatus
+
+# Rótulo gravado no CleanedProductDTO (value ou value.capitalize()) -> enum
+_STATUS_BY_LABEL = {s.value.capitalize(): s for s in ProductStatus} | {s.value: s for s in ProductStatus}
+_STATUS_ORDER = list(ProductStatus)
+
+class MetricsAccumulator:
+    """
+    Acumula estatísticas e métricas do dashboard bloco a bloco, para que o
+    pipeline em streaming nunca precise da lista completa de produtos.
+    Acumuladores parciais (páginas, threads, processos) se combinam com merge():
+    a memória extra é constante, fora o conjunto de categorias.
+    """
+
+    def __init__(self):
+        self.stats: Dict[str, int] = {status.value: 0 for status in ProductStatus}
+        self.stats["total"] = 0
+        self.total_value = 0.0
+        self.categories: Set[str] = set()
+        self.min_price: Optional[float] = None
+        self.max_price: Optional[float] = None
+
+    @property
+    def critical_alerts(self) -> int:
+        # Contagem pelo enum, não por busca de "⚠️" no texto do status
+        return self.stats[ProductStatus.CRITICO.value]
+
+    def add(self, cleaned_chunk, chunk_stats: Dict[str, int] = None) -> "MetricsAccumulator":
+        """Soma um bloco de produtos limpos; sem chunk_stats, conta os status do próprio bloco"""
+        if hasattr(cleaned_chunk, "total_stock_values"):
+            # Bloco colunar (ProductColumns): reduz direto nos arrays (o NumPy já está carregado)
+            import numpy as np
+            if not len(cleaned_chunk):
+                return self
+            self.total_value += float(cleaned_chunk.total_stock_values.sum())
+            self.categories.update(cleaned_chunk.unique_categories())
+            self._update_prices(float(cleaned_chunk.prices.min()), float(cleaned_chunk.prices.max()))
+            if chunk_stats is None:
+                counts = np.bincount(cleaned_chunk.status_codes, minlength=len(_STATUS_ORDER))
+                chunk_stats = {status.value: int(counts[i]) for i, status in enumerate(_STATUS_ORDER)}
+                chunk_stats["total"] = len(cleaned_chunk)
+        else:
+            counts = {status.value: 0 for status in ProductStatus} if chunk_stats is None else None
+            total = 0
+            for p in cleaned_chunk:
+                self.total_value += p.total_stock_value
+                self.categories.add(p.category)
+                self._update_prices(p.price, p.price)
+                if counts is not None:
+                    counts[_STATUS_BY_LABEL[p.status].value] += 1
+                total += 1
+            if counts is not None:
+                counts["total"] = total
+                chunk_stats = counts
+
+        for key, value in chunk_stats.items():
+            self.stats[key] = self.stats.get(key, 0) + value
+        return self
+
+    def merge(self, other: "MetricsAccumulator") -> "MetricsAccumulator":
+        """Combina um acumulador parcial (ex.: de outro worker) neste"""
+        for key, value in other.stats.items():
+            self.stats[key] = self.stats.get(key, 0) + value
+        self.total_value += other.total_value
+        self.categories |= other.categories
+        if other.min_price is not None:
+            self._update_prices(other.min_price, other.max_price)
+        return self
+
+    def metrics(self) -> Dict[str, float]:
+        """Mesmo formato de IDataService.get_dashboard_metrics"""
+        return {
+            "total_value": self.total_value,
+            "critical_alerts": self.critical_alerts,
+            "unique_categories": len(self.categories),
+            "min_price": self.min_price or 0.0,
+            "max_price": self.max_price or 0.0,
+        }
+
+    def _update_prices(self, low: float, high: float):
+        if self.min_price is None or low < self.min_price:
+            self.min_price = low
+        if self.max_price is None or high > self.max_price:
+            self.max_price = high
@@ -0,0 +1,55 @@
+import random
+import threading
+from datetime import datetime as dt
+from typing import Callable, Dict
+
+class PipelineScheduler:
+    """
+    Executa os pipelines em intervalo fixo dentro de um único processo, para
+    que Session HTTP, cache e imports continuem aquecidos entre as execuções.
+    - Execuções nunca se sobrepõem (laço único, um job por vez)
+    - Jitter evita que vários agendadores batam na API no mesmo segundo
+    - Falhas seguidas aumentam a espera (backoff exponencial até max_backoff)
+    """
+
+    def __init__(self, jobs: Dict[str, Callable[[], bool]], interval: float,
+                 jitter: float = 0.1, max_backoff: float = 3600.0):
+        self.jobs = jobs
+        self.interval = interval
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.failures = 0
+        self._stop = threading.Event()
+
+    def run_forever(self, max_runs: int = None):
+        runs = 0
+        while not self._stop.is_set():
+            sucesso = self.run_once()
+            runs += 1
+            if max_runs is not None and runs >= max_runs:
+                break
+
+            delay = self.next_delay(sucesso)
+            print(f"[{dt.now().strftime('%H:%M:%S')}] [DAEMON] Próxima execução em {delay:.0f}s")
+            self._stop.wait(delay)
+
+    def run_once(self) -> bool:
+        sucesso = True
+        for name, job in self.jobs.items():
+            print(f"[{dt.now().strftime('%H:%M:%S')}] [DAEMON] Executando '{name}'...")
+            try:
+                ok = job()
+            except Exception as e:
+                print(f"[DAEMON] '{name}' falhou: {type(e).__name__} - {e}")
+                ok = False
+            sucesso = sucesso and bool(ok)
+        return sucesso
+
+    def next_delay(self, sucesso: bool) -> float:
+        self.failures = 0 if sucesso else self.failures + 1
+        # Expoente limitado: 2^64 já passa de qualquer max_backoff e não estoura o float
+        base = min(self.interval * (2 ** min(self.failures, 64)), max(self.max_backoff, self.interval))
+        return max(0.0, base * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def stop(self):
+        self._stop.set()
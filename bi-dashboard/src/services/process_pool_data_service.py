@@ -0,0 +1,117 @@
+import json
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, Sequence, Tuple, Union
+from models.product_dto import ProductDTO
+from models.product_columns import ProductColumns
+from interfaces.Idata_service import IDataService
+from services.columnar_data_service import ColumnarDataService
+from services.metrics_accumulator import MetricsAccumulator
+
+
+Page = Union[bytes, Sequence[Union[ProductDTO, Dict[str, Any]]]]
+
+
+def _transform_payload(payload: bytes) -> Tuple[ProductColumns, MetricsAccumulator]:
+    """Roda no worker: JSON bruto -> colunas + estatísticas/métricas parciais"""
+    # Aceita tanto a lista de produtos quanto o envelope da API ({"products": [...], ...})
+    columns, stats = ColumnarDataService(raw_page_size=0).prepare_json(payload)
+    return columns, MetricsAccumulator().add(columns, stats)
+
+
+def encode_page(page: Page) -> bytes:
+    """
+    Página -> JSON em bytes: é isso que cruza o limite do processo, não objetos pydantic.
+    Corpos brutos da API (bytes) passam direto; só eles escalam de fato com os núcleos,
+    pois o processo principal não desserializa nada.
+    """
+    if isinstance(page, (bytes, bytearray, memoryview)):
+        return bytes(page)
+    if page and isinstance(page[0], ProductDTO):
+        from models.products_response_dto import PRODUCT_LIST_ADAPTER
+        return PRODUCT_LIST_ADAPTER.dump_json(list(page))
+    return json.dumps(list(page), ensure_ascii=False).encode("utf-8")
+
+
+class ProcessPoolDataService(IDataService):
+    """
+    Motor colunar distribuído entre processos, para catálogos muito grandes:
+    as regras com texto (truncar título, capitalize, valores padrão) seguram
+    o GIL, então cada worker trata um bloco por conta própria.
+    Os blocos vão como JSON em bytes e voltam como ProductColumns (arrays +
+    buffer de títulos); estatísticas e métricas de cada worker são somadas
+    com MetricsAccumulator.merge no processo principal.
+    Listas pequenas são tratadas no próprio processo (o pool não compensa).
+    Listas de DTOs ainda precisam ser serializadas no processo principal, o que
+    limita o ganho; o streaming usa raw_page_size para receber os corpos brutos.
+    """
+
+    def __init__(self, workers: int = None, batch_size: int = None, min_parallel: int = None,
+                 start_method: str = None, raw_page_size: int = None):
+        # 0 (no argumento ou no .env) = um worker por núcleo
+        workers = workers if workers is not None else int(os.getenv("BI_TRANSFORM_WORKERS", "0"))
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size if batch_size is not None else int(os.getenv("BI_TRANSFORM_BATCH", "50000"))
+        self.min_parallel = min_parallel if min_parallel is not None else int(os.getenv("BI_TRANSFORM_MIN_PARALLEL", "20000"))
+        # spawn: o processo principal tem threads (HTTP, Notion) e fork com threads não é seguro
+        self.start_method = start_method or os.getenv("BI_TRANSFORM_START_METHOD", "spawn")
+        # Streaming: páginas JSON brutas da API vão direto para os workers (o processo
+        # principal não desserializa nem reserializa nada)
+        self.raw_page_size = raw_page_size if raw_page_size is not None else int(os.getenv("BI_TRANSFORM_PAGE_SIZE", "1000"))
+        self.inline = ColumnarDataService(raw_page_size=0)
+        self._pool = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        # Criado no primeiro uso e reaproveitado (no daemon os workers ficam aquecidos)
+        if self._pool is None:
+            context = multiprocessing.get_context(self.start_method)
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        return self._pool
+
+    def prepare_products(self, raw_products: Sequence[Union[ProductDTO, Dict[str, Any]]]) -> Tuple[ProductColumns, dict]:
+        if len(raw_products) < self.min_parallel or self.workers == 1:
+            return self.inline.prepare_products(raw_products)
+
+        # Blocos de tamanho parecido: no mínimo um por worker
+        size = max(1, min(self.batch_size, -(-len(raw_products) // self.workers)))
+        batches = (raw_products[i:i + size] for i in range(0, len(raw_products), size))
+        accumulator = MetricsAccumulator()
+        parts = list(self._run(batches, accumulator))
+        return ProductColumns.concat(parts), dict(accumulator.stats)
+
+    def prepare_stream(self, pages: Iterable[Page], accumulator: MetricsAccumulator) -> Iterator[ProductColumns]:
+        """Páginas de DTOs/dicts ou corpos JSON brutos (ex.: DummyJsonController.iter_raw_pages)"""
+        return self._run(pages, accumulator)
+
+    def get_dashboard_metrics(self, cleaned_products: ProductColumns) -> dict:
+        return self.inline.get_dashboard_metrics(cleaned_products)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _run(self, pages: Iterable[Page], accumulator: MetricsAccumulator) -> Iterator[ProductColumns]:
+        """Mantém até 2 blocos por worker em voo e devolve os resultados na ordem das páginas"""
+        in_flight: deque[Future] = deque()
+        try:
+            for page in pages:
+                if not page:
+                    continue
+                in_flight.append(self.pool.submit(_transform_payload, encode_page(page)))
+                if len(in_flight) >= self.workers * 2:
+                    yield self._collect(in_flight.popleft(), accumulator)
+            while in_flight:
+                yield self._collect(in_flight.popleft(), accumulator)
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    @staticmethod
+    def _collect(future: Future, accumulator: MetricsAccumulator) -> ProductColumns:
+        columns, partial = future.result()
+        accumulator.merge(partial)
+        return columns
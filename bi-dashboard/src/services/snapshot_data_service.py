@@ -0,0 +1,58 @@
+from typing import Iterable, Iterator, List, Tuple
+from models.product_dto import ProductDTO
+from models.cleaned_product_dto import CleanedProductDTO
+from interfaces.Idata_service import IDataService
+from interfaces.Isnapshot_store import ISnapshotStore
+from services.metrics_accumulator import MetricsAccumulator
+from services.instrumentation import current_pipeline, current_run
+
+class SnapshotDataService(IDataService):
+    """
+    Decorador do IDataService: tudo o que sai do tratamento também é gravado
+    no histórico local. Cada execução de pipeline (Instrumentation.run) vira
+    um único run, por mais páginas que passem pelo tratamento; fora de um
+    run, cada chamada (ou um prepare_stream inteiro) vira o seu próprio.
+    """
+
+    def __init__(self, service: IDataService, store: ISnapshotStore):
+        self.service = service
+        self.store = store
+        # (etapas do run de instrumentação, run_id no histórico) da execução atual
+        self._current = (None, None)
+
+    @property
+    def raw_page_size(self):
+        return self.service.raw_page_size
+
+    def prepare_products(self, raw_products: List[ProductDTO]) -> Tuple[List[CleanedProductDTO], dict]:
+        cleaned, stats = self.service.prepare_products(raw_products)
+        if cleaned:
+            self._safe_append(cleaned)
+        return cleaned, stats
+
+    def prepare_stream(self, pages: Iterable[List[ProductDTO]], accumulator: MetricsAccumulator) -> Iterator[List[CleanedProductDTO]]:
+        run_id = None
+        for chunk in self.service.prepare_stream(pages, accumulator):
+            if chunk:
+                run_id = self._safe_append(chunk, run_id)
+            yield chunk
+
+    def get_dashboard_metrics(self, cleaned_products: List[CleanedProductDTO]) -> dict:
+        return self.service.get_dashboard_metrics(cleaned_products)
+
+    def _safe_append(self, chunk, run_id=None):
+        # O histórico é um extra: falha no disco não pode derrubar o pipeline
+        try:
+            if run_id is None:
+                run_id = self._run_id()
+            self.store.append(run_id, chunk)
+        except Exception as e:
+            print(f"⚠️ Histórico local não atualizado: {e}")
+        return run_id
+
+    def _run_id(self) -> int:
+        run = current_run()
+        if run is None or run is not self._current[0]:
+            # Nova execução (as páginas do relatório no terminal caem todas no mesmo run)
+            self._current = (run, self.store.begin_run(current_pipeline()))
+        return self._current[1]
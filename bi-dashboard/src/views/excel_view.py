@@ -1,33 +1,80 @@
+import os
 from interfaces.Iproduct_source import IProductSource
 from interfaces.Idata_service import IDataService
 from interfaces.Iexcel_exporter import IExcelExporter
+from services.metrics_accumulator import MetricsAccumulator
+from services.instrumentation import Instrumentation
 
 class ExcelView:
-    def __init__(self, source: IProductSource, service: IDataService, exporter: IExcelExporter):
+    def __init__(self, source: IProductSource, service: IDataService, exporter: IExcelExporter,
+                 filename: str = "relatorio_adm.xlsx", instrumentation: Instrumentation = None):
         self.source = source
         self.service = service
         self.exporter = exporter
+        # A extensão define o formato: .xlsx, .csv ou .parquet
+        self.filename = filename
+        self.instrumentation = instrumentation or Instrumentation()
         
     def run_export(self):
         print("\n" + "="*70)
         print(" INICIANDO EXPORTAÇÃO PARA BI (EXCEL) ".center(70, " "))
         print("="*70)
-        
-        # 1. Busca os dados (Lógica da API agora na View)
-        raw_data = self.source.fetch_products(limit=50, skip=0)
-        
-        if raw_data:
-            # 2. Tratamento
-            clean_products, stats = self.service.prepare_products(raw_data)
-            
-            # 3. Exportação
-            sucesso = self.exporter.send_to_excel(clean_products, "relatorio_adm.xlsx")
-            
-            if sucesso:
-                print(f"\n[OK] Arquivo salvo com sucesso!")
-                print(f"Sua parceira já pode abrir o arquivo no notebook dela.")
+
+        with self.instrumentation.run("excel"):
+            # 1. Busca os dados (Lógica da API agora na View)
+            with self.instrumentation.stage("extract") as st:
+                raw_data = self.source.fetch_products(limit=50, skip=0)
+                st.items += len(raw_data or ())
+
+            if raw_data:
+                # 2. Tratamento
+                with self.instrumentation.stage("transform") as st:
+                    clean_products, stats = self.service.prepare_products(raw_data)
+                    st.items += len(clean_products)
+
+                # 3. Exportação
+                with self.instrumentation.stage("load") as st:
+                    sucesso = self.exporter.send_to_excel(clean_products, self.filename)
+                    st.items += len(clean_products)
+                    st.errors += not sucesso
+
+                if sucesso:
+                    print(f"\n[OK] Arquivo salvo com sucesso!")
+                    print(f"Sua parceira já pode abrir o arquivo no notebook dela.")
+                else:
+                    print("\n[ERRO] Falha ao gravar o arquivo. Verifique se o Excel está aberto.")
             else:
-                print("\n[ERRO] Falha ao gravar o arquivo. Verifique se o Excel está aberto.")
+                sucesso = False
+                print("\n[ERRO] Não foi possível conectar à API.")
+        print("="*70 + "\n")
+        return sucesso
+
+    def run_streaming_export(self, page_size=50):
+        """Exporta o catálogo completo em streaming: página -> tratamento -> planilha"""
+        print("\n" + "="*70)
+        print(" EXPORTAÇÃO COMPLETA EM STREAMING (EXCEL) ".center(70, " "))
+        print("="*70)
+
+        instr = self.instrumentation
+        with instr.run("excel_stream"):
+            accumulator = MetricsAccumulator()
+            # Cada etapa mede apenas o próprio tempo, mesmo intercaladas página a página
+            pages = instr.timed_iter("extract", self.source.pages(page_size, self.service.raw_page_size))
+            chunks = instr.timed_iter("transform", self.service.prepare_stream(pages, accumulator))
+
+            try:
+                base, extension = os.path.splitext(self.filename)
+                with instr.stage("load") as st:
+                    sucesso = self.exporter.send_chunks_to_excel(chunks, f"{base}_completo{extension}")
+                    st.items += accumulator.stats["total"]
+                    st.errors += not sucesso
+            except Exception as e:
+                print(f"\n[ERRO] Falha durante o streaming: {e}")
+                sucesso = False
+
+        if sucesso:
+            print(f"\n[OK] {accumulator.stats['total']} produtos exportados!")
         else:
-            print("\n[ERRO] Não foi possível conectar à API.")
-        print("="*70 + "\n")
\ No newline at end of file
+            print("\n[ERRO] Falha ao gravar o arquivo. Verifique se o Excel está aberto.")
+        print("="*70 + "\n")
+        return sucesso
@@ -0,0 +1,66 @@
+from typing import Optional
+from enums.product_status import ProductStatus
+from interfaces.Isnapshot_store import ISnapshotStore
+
+class HistoryView:
+    """Relatórios lidos do histórico local: nenhuma chamada à API"""
+
+    def __init__(self, store: ISnapshotStore):
+        self.store = store
+
+    def run_local_report(self, category: Optional[str] = None):
+        products = self.store.latest_snapshot(category=category)
+        if not products:
+            print("\n⚠️ Histórico local vazio. Rode um relatório, exportação ou sync primeiro.")
+            return False
+
+        print("\n" + "="*90)
+        print(f" ÚLTIMO SNAPSHOT LOCAL ({len(products)} produtos) ".center(90, "="))
+        print("="*90)
+        print(f"{'ID':<4} | {'PRODUTO':<25} | {'MARCA':<15} | {'PREÇO':<10} | {'ESTOQUE':<8} | STATUS")
+        print("-" * 90)
+        for p in products:
+            print(f"{p.id:<4} | {p.display_title:<25} | {p.brand[:15]:<15} | ${p.price:<9} | {p.stock:<8} | {p.status}")
+        print("-" * 90)
+        total_value = sum(p.total_stock_value for p in products)
+        print(f"VALOR TOTAL EM ESTOQUE: ${total_value:,.2f}".rjust(90))
+        print("=" * 90)
+        return True
+
+    def run_history(self, product_id: Optional[int] = None, status: Optional[str] = None):
+        """Histórico de um produto ou, sem produto, as mudanças de status (ex.: --status ESGOTADO)"""
+        if product_id is not None and status is None:
+            return self._show_product(product_id)
+
+        try:
+            wanted = ProductStatus[status.upper()] if status else None
+        except KeyError:
+            print(f"❌ Status inválido: {status} (use {', '.join(s.name for s in ProductStatus)})")
+            return False
+
+        transitions = self.store.status_transitions(product_id=product_id, status=wanted)
+        print("\n" + "="*90)
+        print(" MUDANÇAS DE STATUS ".center(90, "="))
+        print("="*90)
+        if not transitions:
+            print("Nenhuma mudança de status registrada.")
+        for run_at, pid, title, previous, current in transitions:
+            print(f"{run_at} | {pid:<4} | {title[:30]:<30} | {previous.value} -> {current.value}")
+        print("=" * 90)
+        return True
+
+    def _show_product(self, product_id: int):
+        history = self.store.product_history(product_id)
+        if not history:
+            print(f"\n⚠️ Produto {product_id} não encontrado no histórico local.")
+            return False
+
+        print("\n" + "="*90)
+        print(f" HISTÓRICO - {history[-1][1].full_title[:60]} (ID {product_id}) ".center(90, "="))
+        print("="*90)
+        print(f"{'RUN (UTC)':<25} | {'PREÇO':<10} | {'ESTOQUE':<8} | STATUS")
+        print("-" * 90)
+        for run_at, p in history:
+            print(f"{run_at:<25} | ${p.price:<9} | {p.stock:<8} | {p.status}")
+        print("=" * 90)
+        return True
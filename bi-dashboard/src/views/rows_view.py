@@ -3,15 +3,29 @@ import time
 from interfaces.Iproduct_source import IProductSource
 from interfaces.Idata_service import IDataService
 from interfaces.Iproduct_exporter import IProductExporter
+from services.metrics_accumulator import MetricsAccumulator
+from services.instrumentation import Instrumentation
 
 class RowsView:
-    def __init__(self, source: IProductSource, service: IDataService, exporter: IProductExporter):
+    def __init__(self, source: IProductSource, service: IDataService, exporter: IProductExporter,
+                 instrumentation: Instrumentation = None):
         # Injeção de Dependência via Construtor
         self.source = source
         self.service = service
         self.exporter = exporter
+        self.instrumentation = instrumentation or Instrumentation()
 
     def run_rows_sync(self):
+        with self.instrumentation.run("rows"):
+            return self._rows_sync()
+
+    def run_streaming_rows_sync(self, page_size=50):
+        """Sincroniza o catálogo completo em streaming, com memória constante"""
+        with self.instrumentation.run("rows_stream"):
+            return self._streaming_rows_sync(page_size)
+
+    def _rows_sync(self):
+        instr = self.instrumentation
         start_time = time.time()
         print("\n" + "="*70)
         print(f" GREG COMPANY | AUTOMATION ENGINE v1.1 ".center(70, " "))
@@ -20,7 +34,9 @@ class RowsView:
         try:
             # 1. ETAPA: EXTRAÇÃO
             print(f"[{dt.now().strftime('%H:%M:%S')}] [EXTRACAO] Capturando dados...")
-            raw_products = self.source.fetch_products(limit=50, skip=0)
+            with instr.stage("extract") as st:
+                raw_products = self.source.fetch_products(limit=50, skip=0)
+                st.items += len(raw_products or ())
             
             if not raw_products:
                 raise ValueError("A fonte de dados retornou uma lista vazia.")
@@ -28,19 +44,26 @@ class RowsView:
             # 2. ETAPA: TRANSFORMAÇÃO (Com try/except específico)
             try:
                 print(f"[{dt.now().strftime('%H:%M:%S')}] [PROCESSAMENTO] Aplicando regras...")
-                clean_products, stats = self.service.prepare_products(raw_products)
-                
+                with instr.stage("transform") as st:
+                    clean_products, stats = self.service.prepare_products(raw_products)
+                    st.items += len(clean_products)
+
                 print(f"    +- Total: {stats['total']} | OK: {stats.get('🟢 OK', 0)}")
                 print(f"    +- Criticos: {stats.get('⚠️ CRÍTICO', 0)} | Esgotados: {stats.get('🔴 ESGOTADO', 0)}")
 
-                metrics = self.service.get_dashboard_metrics(clean_products)
+                with instr.stage("metrics") as st:
+                    metrics = self.service.get_dashboard_metrics(clean_products)
+                    st.items += len(clean_products)
             except Exception as e:
                 print(f"[ERRO] TRANSFORMACAO: Falha ao processar tipos ou calculos. Detalhes: {e}")
-                return
+                return False
 
             # 3. ETAPA: CARGA (LOAD)
-            print(f"[{dt.now().strftime('%H:%M:%S')}] [UPLOAD] Sincronizando com Rows.com...")
-            sucesso = self.exporter.send_to_rows(clean_products, metrics)
+            print(f"[{dt.now().strftime('%H:%M:%S')}] [UPLOAD] Sincronizando com Rows.com (incremental)...")
+            with instr.stage("load") as st:
+                sucesso = self.exporter.sync_changes_to_rows(clean_products, metrics)
+                st.items += len(clean_products)
+                st.errors += not sucesso
 
             if sucesso:
                 duration = round(time.time() - start_time, 2)
@@ -49,10 +72,56 @@ class RowsView:
                 print("-"*70 + "\n")
             else:
                 print("\n[AVISO] O pipeline terminou, mas a API de destino reportou falha.")
+            return sucesso
 
         except ConnectionError as ce:
             print(f"\n[ERRO] REDE: Nao foi possivel alcançar o servidor. {ce}")
         except ValueError as ve:
             print(f"\n[ERRO] VALIDACAO: {ve}")
         except Exception as e:
-            print(f"\n[ERRO CRITICO] NAO ESPERADO: {type(e).__name__} - {e}")
\ No newline at end of file
+            print(f"\n[ERRO CRITICO] NAO ESPERADO: {type(e).__name__} - {e}")
+        return False
+
+    def _streaming_rows_sync(self, page_size):
+        instr = self.instrumentation
+        start_time = time.time()
+        print("\n" + "="*70)
+        print(f" GREG COMPANY | AUTOMATION ENGINE v1.1 (STREAMING) ".center(70, " "))
+        print("="*70)
+
+        try:
+            print(f"[{dt.now().strftime('%H:%M:%S')}] [PIPELINE] Extração -> Transformação -> Upload por página...")
+            accumulator = MetricsAccumulator()
+            pages = instr.timed_iter("extract", self.source.pages(page_size, self.service.raw_page_size))
+            chunks = instr.timed_iter("transform", self.service.prepare_stream(pages, accumulator))
+            with instr.stage("load") as st:
+                sucesso = self.exporter.send_chunks_to_rows(chunks, accumulator)
+                st.items += accumulator.stats["total"]
+                st.errors += not sucesso
+
+            stats = accumulator.stats
+            print(f"    +- Total: {stats['total']} | OK: {stats.get('🟢 OK', 0)}")
+            print(f"    +- Criticos: {stats.get('⚠️ CRÍTICO', 0)} | Esgotados: {stats.get('🔴 ESGOTADO', 0)}")
+
+            if sucesso:
+                duration = round(time.time() - start_time, 2)
+                print("\n" + "-"*70)
+                print(f" [SUCESSO] Automacao concluida em {duration}s!")
+                print("-"*70 + "\n")
+            else:
+                print("\n[AVISO] O pipeline terminou, mas a API de destino reportou falha.")
+            return sucesso
+
+        except ConnectionError as ce:
+            print(f"\n[ERRO] REDE: Nao foi possivel alcançar o servidor. {ce}")
+        except Exception as e:
+            print(f"\n[ERRO CRITICO] NAO ESPERADO: {type(e).__name__} - {e}")
+        return False
+
+    def run_resume_upload(self):
+        print(f"[{dt.now().strftime('%H:%M:%S')}] [UPLOAD] Reenviando blocos pendentes para o Rows.com...")
+        if self.exporter.resume_failed_upload():
+            print(" [SUCESSO] Nenhum bloco pendente.")
+            return True
+        print("\n[AVISO] Ainda há blocos pendentes. Tente novamente mais tarde.")
+        return False
@@ -1,61 +1,181 @@
+import contextvars
+import logging
+import os
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator, List, TextIO
+import requests
 from models.cleaned_product_dto import CleanedProductDTO
 
 from interfaces.Iproduct_source import IProductSource
 from interfaces.Idata_service import IDataService
+from models.product_dto import ProductDTO
+from services.instrumentation import Instrumentation
+from services.metrics_accumulator import MetricsAccumulator
+
+# Debug via logging (BI_LOG_LEVEL=DEBUG): desligado, não formata nada
+logger = logging.getLogger(__name__)
+
+WIDTH = 90
 
 
 class TerminalView:
-    def __init__(self, source: IProductSource, service: IDataService):
+    """
+    Relatório de inventário paginado. Cada página é montada inteira num
+    buffer e sai com uma única escrita (terminal, arquivo ou pipe), enquanto
+    a próxima página já é buscada em segundo plano.
+    BI_REPORT_PAGES (0 = catálogo completo), BI_REPORT_PAGE_SIZE e
+    BI_REPORT_OUTPUT (arquivo de saída) definem os padrões.
+    """
+
+    def __init__(self, source: IProductSource, service: IDataService, instrumentation: Instrumentation = None,
+                 page_size: int = None, total_pages: int = None, output: str = None):
         self.source = source
         self.service = service
+        self.instrumentation = instrumentation or Instrumentation()
+        self.page_size = page_size or int(os.getenv("BI_REPORT_PAGE_SIZE", "10"))
+        self.total_pages = total_pages if total_pages is not None else int(os.getenv("BI_REPORT_PAGES", "2"))
+        self.output = output or os.getenv("BI_REPORT_OUTPUT")
+
+    def run_full_report(self, page_size: int = None, output: str = None):
+        """Catálogo completo, página a página"""
+        return self.run_report(total_pages=0, page_size=page_size, output=output)
+
+    def run_report(self, total_pages: int = None, page_size: int = None, output: str = None):
+        total_pages = self.total_pages if total_pages is None else total_pages
+        limit = page_size or self.page_size
+        output = output or self.output
+        logger.debug("Iniciando run_report - Total de páginas: %s, tamanho: %s", total_pages or "todas", limit)
+
+        if output:
+            os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+            # Buffer grande: no arquivo, várias páginas saem numa única escrita no disco
+            with open(output, "w", encoding="utf-8", buffering=1 << 20) as stream:
+                ok = self._report(stream, total_pages, limit)
+            print(f"✅ Relatório gravado em {output}" if ok else f"⚠️ Relatório incompleto gravado em {output}")
+            return ok
+        return self._report(sys.stdout, total_pages, limit)
 
-    def run_report(self,total_pages=2):
-        print(f"🔍 [DEBUG] Iniciando run_report - Total de páginas: {total_pages}")
+    def _report(self, stream: TextIO, total_pages: int, limit: int):
         pagina_atual = 1
-        skip = 0
-        limit = 10
+        # Total corrente do relatório: cada página é somada com merge()
+        acumulado = MetricsAccumulator()
+        completo = True
+
+        try:
+            with self.instrumentation.run("report"):
+                paginas = self._pages(total_pages, limit)
+                try:
+                    for raw_data in paginas:
+                        logger.debug("Página %s - Dados recebidos: %s produtos", pagina_atual, len(raw_data))
+
+                        with self.instrumentation.stage("transform") as st:
+                            clean_products, stats = self.service.prepare_products(raw_data)
+                            st.items += len(clean_products)
+
+                        logger.debug("Produtos limpos: %s, Stats: %s", len(clean_products), stats)
+
+                        with self.instrumentation.stage("metrics"):
+                            pagina = MetricsAccumulator().add(clean_products, stats)
+                            acumulado.merge(pagina)
+
+                        with self.instrumentation.stage("load") as st:
+                            stream.write(self._render_page(pagina_atual, clean_products,
+                                                           pagina.total_value, acumulado.total_value))
+                            if stream is sys.stdout:
+                                # Terminal/pipe: a página aparece inteira assim que fica pronta
+                                stream.flush()
+                            st.items += len(clean_products)
+
+                        pagina_atual += 1
+                except requests.exceptions.RequestException as e:
+                    # Página que falhou no meio do catálogo: o relatório não sai como se estivesse completo
+                    print(f"❌ Relatório interrompido na página {pagina_atual}: {e}")
+                    completo = False
+                finally:
+                    paginas.close()
 
-        while pagina_atual <= total_pages:
-            print(f"🔍 [DEBUG] Página {pagina_atual} - Buscando produtos (skip={skip}, limit={limit})")
-            
-            # Busca os dados - retorna List[ProductDTO]
+            if acumulado.stats["total"]:
+                stream.write(self._format_summary(acumulado))
+        except BrokenPipeError:
+            # Saída fechada antes do fim (ex.: `| head`): encerra sem erro
+            logger.debug("Saída fechada na página %s. Encerrando.", pagina_atual)
+            if stream is sys.stdout:
+                os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+
+        logger.debug("Relatório concluído!")
+        return completo and pagina_atual > 1
+
+    def _pages(self, total_pages: int, limit: int) -> Iterator[List[ProductDTO]]:
+        if not total_pages:
+            # Catálogo completo: a fonte busca as próximas páginas em paralelo (janela limitada)
+            yield from self.instrumentation.timed_iter("extract", self.source.iter_pages(page_size=limit))
+            return
+
+        # Poucas páginas: uma thread basta, só a próxima página fica em voo
+        prefetch = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report-prefetch")
+        try:
+            pendente = self._fetch_async(prefetch, limit, 0)
+            pagina = 1
+            while pendente is not None:
+                raw_data = pendente.result()
+                if not raw_data:
+                    logger.debug("Nenhum dado retornado. Encerrando loop.")
+                    return
+                # Página incompleta é a última: não há o que buscar depois dela
+                ultima = len(raw_data) < limit or pagina >= total_pages
+                pendente = None if ultima else self._fetch_async(prefetch, limit, pagina * limit)
+                yield raw_data
+                pagina += 1
+        finally:
+            prefetch.shutdown(wait=True, cancel_futures=True)
+
+    def _fetch_async(self, pool: ThreadPoolExecutor, limit: int, skip: int) -> Future:
+        # copy_context: a busca em segundo plano conta na etapa "extract" deste run
+        return pool.submit(contextvars.copy_context().run, self._fetch, limit, skip)
+
+    def _fetch(self, limit: int, skip: int) -> List[ProductDTO]:
+        with self.instrumentation.stage("extract") as st:
             raw_data = self.source.fetch_products(limit=limit, skip=skip)
-            
-            print(f"🔍 [DEBUG] Dados recebidos: {type(raw_data)}, Quantidade: {len(raw_data) if raw_data else 0}")
-            
-            # Corrigido: raw_data é uma lista de ProductDTO, não um dicionário
-            if raw_data:
-                print(f"🔍 [DEBUG] Processando {len(raw_data)} produtos...")
-                clean_products, stats = self.service.prepare_products(raw_data)
-                
-                print(f"🔍 [DEBUG] Produtos limpos: {len(clean_products)}, Stats: {stats}")
-                
-                self._display_header(pagina_atual)
-                self._show_table(clean_products)
-                
-                total = self.service.get_dashboard_metrics(clean_products)
-                self._display_footer(total["total_value"])
-
-                pagina_atual += 1
-                skip += limit
-            else:
-                print(f"⚠️ [DEBUG] Nenhum dado retornado. Encerrando loop.")
-                break
-        
-        print(f"✅ [DEBUG] Relatório concluído!")
-
-    def _display_header(self, page):
-        print("\n" + "="*90)
-        print(f" RELATÓRIO DE INVENTÁRIO - PÁGINA {page} ".center(90, "="))
-        print("="*90)
-        print(f"{'ID':<4} | {'PRODUTO':<25} | {'MARCA':<15} | {'PREÇO':<10} | {'ESTOQUE'}")
-        print("-" * 90)
-    def _show_table(self, products : list[CleanedProductDTO]):
-        for p in products:
-            print(f"{p.id:<4} | {p.full_title:<25} | {p.brand[:15]:<15} | ${p.price:<9} | {p.stock} un")
-
-    def _display_footer(self, total_value):
-        print("-" * 90)
-        print(f"VALOR TOTAL EM ESTOQUE (PÁGINA): ${total_value:,.2f}".rjust(90))
-        print("=" * 90)
-        
\ No newline at end of file
+            st.items += len(raw_data or ())
+        return raw_data or []
+
+    # --- Formatação (strings prontas, sem escrever nada) ---
+
+    def _render_page(self, page, products, total_value, running_value) -> str:
+        return self._format_header(page) + self._format_rows(products) + self._format_footer(total_value, running_value)
+
+    def _format_header(self, page) -> str:
+        return (
+            "\n" + "=" * WIDTH + "\n"
+            + f" RELATÓRIO DE INVENTÁRIO - PÁGINA {page} ".center(WIDTH, "=") + "\n"
+            + "=" * WIDTH + "\n"
+            + f"{'ID':<4} | {'PRODUTO':<25} | {'MARCA':<15} | {'PREÇO':<10} | {'ESTOQUE'}\n"
+            + "-" * WIDTH + "\n"
+        )
+
+    def _format_rows(self, products: list[CleanedProductDTO]) -> str:
+        if hasattr(products, "title_list"):
+            # ProductColumns: lê as colunas de uma vez, sem montar uma linha por produto
+            rows = zip(products.ids.tolist(), products.title_list(), products.brands.tolist(),
+                       products.prices.tolist(), products.stocks.tolist())
+        else:
+            rows = ((p.id, p.full_title, p.brand, p.price, p.stock) for p in products)
+        return "".join(f"{pid:<4} | {title:<25} | {brand[:15]:<15} | ${price:<9} | {stock} un\n"
+                       for pid, title, brand, price, stock in rows)
+
+    def _format_footer(self, total_value, running_value) -> str:
+        return (
+            "-" * WIDTH + "\n"
+            + f"VALOR TOTAL EM ESTOQUE (PÁGINA): ${total_value:,.2f}".rjust(WIDTH) + "\n"
+            + f"VALOR TOTAL EM ESTOQUE (ACUMULADO): ${running_value:,.2f}".rjust(WIDTH) + "\n"
+            + "=" * WIDTH + "\n"
+        )
+
+    def _format_summary(self, acumulado: MetricsAccumulator) -> str:
+        m = acumulado.metrics()
+        return (
+            f" RESUMO: {acumulado.stats['total']} produtos | {m['unique_categories']} categorias | "
+            f"{m['critical_alerts']} críticos | preço ${m['min_price']:,.2f} a ${m['max_price']:,.2f}\n"
+            + "=" * WIDTH + "\n"
+        )
@@ -1,5 +1,10 @@
 from mcp.server.fastmcp import FastMCP
+from collections import OrderedDict
+import fnmatch
+import heapq
 import os
+import threading
+import time
 
 # Inicializa o servidor focado no contexto do Greg Company
 mcp = FastMCP("GregCompany-Context")
@@ -8,13 +13,151 @@ mcp = FastMCP("GregCompany-Context")
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SYSTEM_APP_PATH = os.path.join(PROJECT_ROOT, "system-app")
 
+# Pastas pesadas que nunca entram no índice
+PASTAS_IGNORADAS = {'node_modules', 'bin', 'obj', '.venv', '.git', 'dist', '__pycache__'}
+# Intervalo mínimo entre duas verificações de mudança no disco
+INDICE_TTL = float(os.getenv("CONTEXT_MCP_INDEX_TTL", "2"))
+# Intervalo mínimo entre dois stat() de todos os arquivos conhecidos (edições no lugar)
+CONFERENCIA_TTL = float(os.getenv("CONTEXT_MCP_RESTAT_TTL", "60"))
+# Cache de conteúdo: até N arquivos / M bytes, invalidado pelo mtime
+CONTEUDO_MAX_ARQUIVOS = int(os.getenv("CONTEXT_MCP_CACHE_FILES", "256"))
+CONTEUDO_MAX_BYTES = int(os.getenv("CONTEXT_MCP_CACHE_BYTES", str(32 * 2**20)))
+
+
+class _IndiceArquivos:
+    """
+    Índice em memória de system-app: por pasta, o mtime e os arquivos (tamanho, mtime).
+    A atualização é incremental: só pastas cujo mtime mudou (arquivo criado,
+    removido ou renomeado) são relidas. Edições no lugar não mudam o mtime da
+    pasta: os arquivos já conhecidos das demais pastas recebem um novo stat no
+    máximo a cada CONTEXT_MCP_RESTAT_TTL segundos (ou em atualizar_indice).
+    """
+
+    def __init__(self, raiz):
+        self.raiz = raiz
+        self.pastas = {}  # pasta relativa -> (mtime_ns, {arquivo: (tamanho, mtime_ns)}, [subpastas])
+        self.ultima_verificacao = 0.0
+        self.ultima_conferencia = 0.0
+        self.lock = threading.Lock()
+
+    def atualizar(self, completo=False):
+        with self.lock:
+            if not completo and time.monotonic() - self.ultima_verificacao < INDICE_TTL:
+                return 0
+            if completo:
+                self.pastas.clear()
+            conferir = time.monotonic() - self.ultima_conferencia >= CONFERENCIA_TTL
+            relidas = self._visitar("", conferir)
+            if conferir:
+                self.ultima_conferencia = time.monotonic()
+            # Pastas que sumiram do disco saem do índice
+            vivas = set(self._pastas_alcancaveis(""))
+            for pasta in list(self.pastas):
+                if pasta not in vivas:
+                    del self.pastas[pasta]
+            self.ultima_verificacao = time.monotonic()
+            return relidas
+
+    def arquivos(self):
+        """(caminho relativo, tamanho, mtime_ns) de todos os arquivos indexados"""
+        self.atualizar()
+        with self.lock:
+            return [(os.path.join(pasta, nome), tamanho, mtime)
+                    for pasta, (_, arquivos, _) in self.pastas.items()
+                    for nome, (tamanho, mtime) in arquivos.items()]
+
+    def _visitar(self, pasta, conferir):
+        caminho = os.path.join(self.raiz, pasta)
+        try:
+            mtime = os.stat(caminho).st_mtime_ns
+        except OSError:
+            return 0
+
+        atual = self.pastas.get(pasta)
+        relidas = 0
+        if atual is None or atual[0] != mtime:
+            arquivos, subpastas = {}, []
+            with os.scandir(caminho) as entradas:
+                for entrada in entradas:
+                    try:
+                        if entrada.is_dir(follow_symlinks=False):
+                            if entrada.name not in PASTAS_IGNORADAS:
+                                subpastas.append(os.path.join(pasta, entrada.name))
+                        elif entrada.is_file(follow_symlinks=False):
+                            st = entrada.stat(follow_symlinks=False)
+                            arquivos[entrada.name] = (st.st_size, st.st_mtime_ns)
+                    except OSError:
+                        continue
+            self.pastas[pasta] = (mtime, arquivos, sorted(subpastas))
+            relidas = 1
+        elif conferir:
+            self._conferir_arquivos(caminho, atual[1])
+
+        for sub in self.pastas[pasta][2]:
+            relidas += self._visitar(sub, conferir)
+        return relidas
+
+    def _conferir_arquivos(self, caminho, arquivos):
+        """Atualiza tamanho e mtime dos arquivos de uma pasta que não foi relida"""
+        for nome in list(arquivos):
+            try:
+                st = os.stat(os.path.join(caminho, nome), follow_symlinks=False)
+            except OSError:
+                # Sumiu entre duas verificações sem mudar o mtime da pasta: a próxima leitura resolve
+                del arquivos[nome]
+                continue
+            arquivos[nome] = (st.st_size, st.st_mtime_ns)
+
+    def _pastas_alcancaveis(self, pasta):
+        yield pasta
+        if pasta in self.pastas:
+            for sub in self.pastas[pasta][2]:
+                yield from self._pastas_alcancaveis(sub)
+
+
+class _CacheConteudo:
+    """LRU de conteúdo de arquivos; cada leitura confere mtime e tamanho antes de usar o cache"""
+
+    def __init__(self, max_arquivos, max_bytes):
+        self.max_arquivos = max_arquivos
+        self.max_bytes = max_bytes
+        self.itens = OrderedDict()  # caminho -> (mtime_ns, tamanho, texto)
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+    def ler(self, caminho):
+        st = os.stat(caminho)
+        with self.lock:
+            item = self.itens.get(caminho)
+            if item and item[0] == st.st_mtime_ns and item[1] == st.st_size:
+                self.itens.move_to_end(caminho)
+                return item[2]
+
+        with open(caminho, 'r', encoding='utf-8', errors='replace') as f:
+            texto = f.read()
+
+        with self.lock:
+            antigo = self.itens.pop(caminho, None)
+            if antigo:
+                self.bytes -= antigo[1]
+            if st.st_size <= self.max_bytes:
+                self.itens[caminho] = (st.st_mtime_ns, st.st_size, texto)
+                self.bytes += st.st_size
+            while self.itens and (len(self.itens) > self.max_arquivos or self.bytes > self.max_bytes):
+                _, (_, tamanho, _) = self.itens.popitem(last=False)
+                self.bytes -= tamanho
+        return texto
+
+
+_indice = _IndiceArquivos(SYSTEM_APP_PATH)
+_conteudo = _CacheConteudo(CONTEUDO_MAX_ARQUIVOS, CONTEUDO_MAX_BYTES)
+
 @mcp.tool()
 def explicar_arquitetura():
     """Retorna as regras de arquitetura e padrões do projeto."""
     try:
         instructions_path = os.path.join(PROJECT_ROOT, '.github', 'copilot-instructions.md')
-        with open(instructions_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        return _conteudo.ler(instructions_path)
     except Exception as e:
         return f"Erro ao ler as instruções de arquitetura: {e}"
 
@@ -22,23 +165,101 @@ def explicar_arquitetura():
 def mapear_estrutura_system():
     """Lista as pastas atuais do sistema para evitar criação de arquivos em locais errados."""
     try:
+        _indice.atualizar()
+        with _indice.lock:
+            pastas = list(_indice._pastas_alcancaveis(""))
         estrutura = []
-        for root, dirs, files in os.walk(SYSTEM_APP_PATH):
-            # Ignora pastas pesadas
-            dirs[:] = [d for d in dirs if d not in ['node_modules', 'bin', 'obj', '.venv']]
-            nivel = root.replace(SYSTEM_APP_PATH, '').count(os.sep)
+        for pasta in pastas:
+            nivel = pasta.count(os.sep) + 1 if pasta else 0
             indent = ' ' * 4 * nivel
-            estrutura.append(f"{indent}{os.path.basename(root)}/")
+            estrutura.append(f"{indent}{os.path.basename(pasta or SYSTEM_APP_PATH)}/")
         return "\n".join(estrutura)
     except Exception as e:
         return f"Erro ao ler pastas: {e}"
 
-if __name__ == "__main__":
+@mcp.tool()
+def buscar_arquivos(padrao: str, limite: int = 100):
+    """
+    Procura arquivos no índice por glob. Sem '/', compara só o nome do arquivo
+    (ex.: '*Controller.cs'); com '/', o caminho relativo a system-app (ex.: 'backend/*/Services/*.cs').
+    """
+    try:
+        por_nome = "/" not in padrao
+        achados = []
+        for caminho, tamanho, _ in _indice.arquivos():
+            alvo = os.path.basename(caminho) if por_nome else caminho.replace(os.sep, "/")
+            if fnmatch.fnmatch(alvo, padrao):
+                achados.append(f"{caminho}  ({_formatar_tamanho(tamanho)})")
+        return _listar(achados, limite, f"padrão '{padrao}'")
+    except Exception as e:
+        return f"Erro ao buscar arquivos: {e}"
 
-    mcp.run()
+@mcp.tool()
+def listar_por_extensao(extensao: str, limite: int = 100):
+    """Lista os arquivos de uma extensão (ex.: '.tsx', 'cs') a partir do índice."""
+    try:
+        extensao = "." + extensao.lower().lstrip(".")
+        achados = [f"{caminho}  ({_formatar_tamanho(tamanho)})"
+                   for caminho, tamanho, _ in _indice.arquivos()
+                   if os.path.splitext(caminho)[1].lower() == extensao]
+        return _listar(sorted(achados), limite, f"extensão {extensao}")
+    except Exception as e:
+        return f"Erro ao listar arquivos: {e}"
 
+@mcp.tool()
+def maiores_arquivos(quantidade: int = 20):
+    """Os maiores arquivos de system-app (fora as pastas ignoradas)."""
+    try:
+        maiores = heapq.nlargest(quantidade, _indice.arquivos(), key=lambda a: a[1])
+        return "\n".join(f"{_formatar_tamanho(tamanho):>10}  {caminho}" for caminho, tamanho, _ in maiores)
+    except Exception as e:
+        return f"Erro ao listar arquivos: {e}"
 
+@mcp.tool()
+def ler_arquivo(caminho: str, max_bytes: int = 64000):
+    """Lê um arquivo de system-app (caminho relativo a ela), com cache invalidado pelo mtime. Arquivos .env* são bloqueados."""
+    try:
+        raiz = os.path.realpath(SYSTEM_APP_PATH)
+        completo = os.path.realpath(os.path.join(raiz, caminho))
+        if os.path.commonpath([completo, raiz]) != raiz:
+            return f"Caminho fora de system-app: {caminho}"
+        # Confere o nome pedido e o destino real (um link simbólico não contorna o bloqueio)
+        if any(fnmatch.fnmatch(os.path.basename(c).lower(), ".env*") for c in (caminho, completo)):
+            return f"Acesso negado a arquivo de ambiente: {caminho}"
+        texto = _conteudo.ler(completo)
+        if len(texto) > max_bytes:
+            return texto[:max_bytes] + f"\n[... cortado: {len(texto)} caracteres no total]"
+        return texto
+    except Exception as e:
+        return f"Erro ao ler {caminho}: {e}"
 
+@mcp.tool()
+def atualizar_indice(completo: bool = False):
+    """Força a verificação do índice agora, com novo stat dos arquivos conhecidos (completo=True revarre todas as pastas)."""
+    try:
+        inicio = time.perf_counter()
+        _indice.ultima_verificacao = 0.0
+        _indice.ultima_conferencia = 0.0
+        relidas = _indice.atualizar(completo=completo)
+        total = sum(len(arquivos) for _, arquivos, _ in _indice.pastas.values())
+        return (f"Índice atualizado: {relidas} pasta(s) relida(s), {len(_indice.pastas)} pastas, "
+                f"{total} arquivos em {(time.perf_counter() - inicio) * 1000:.0f} ms")
+    except Exception as e:
+        return f"Erro ao atualizar índice: {e}"
+
+def _listar(achados, limite, descricao):
+    if not achados:
+        return f"Nenhum arquivo encontrado para {descricao}."
+    extra = f"\n[... mais {len(achados) - limite} arquivo(s)]" if len(achados) > limite else ""
+    return f"--- {len(achados)} arquivo(s) para {descricao} ---\n" + "\n".join(achados[:limite]) + extra
 
+def _formatar_tamanho(tamanho):
+    for unidade in ("B", "KB", "MB"):
+        if tamanho < 1024:
+            return f"{tamanho:.0f} {unidade}"
+        tamanho /= 1024
+    return f"{tamanho:.1f} GB"
 
+if __name__ == "__main__":
 
+    mcp.run()
@@ -1,10 +1,44 @@
 from mcp.server.fastmcp import FastMCP
 import docker # Biblioteca para conversar com o Docker Desktop
 import os
+import re
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 
 mcp = FastMCP("GregCompany-Logs")
 client = docker.from_env() # Conecta no seu Docker Desktop automaticamente
 
+# Limite padrão de resposta: o cliente MCP não precisa de megabytes de log
+MAX_BYTES_PADRAO = int(os.getenv("LOG_MCP_MAX_BYTES", "16000"))
+# Sem 'desde', a busca varre só as últimas N linhas do container (não o histórico inteiro)
+BUSCA_TAIL = int(os.getenv("LOG_MCP_SEARCH_TAIL", "5000"))
+
+# Palavras que identificam o nível em cada linha (ASP.NET: "fail:", "warn:"; Mongo/Redis/SQL: "ERROR", "Warning"...)
+NIVEIS = {
+    "debug": ("debug", "dbug", "trace", "trce", "verbose"),
+    "info": ("info", "information", "notice"),
+    "warn": ("warn", "warning"),
+    "error": ("error", "err", "fail", "failed", "fatal", "crit", "critical", "exception"),
+}
+ORDEM_NIVEIS = list(NIVEIS)
+
+# Cursor por (serviço, padrão, nível) para acompanhar_logs: timestamp da última linha entregue
+_cursores = {}
+_cursores_lock = threading.Lock()
+
+# Saúde da infra: serviços lidos do docker-compose.yml e resultado em cache curto
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMPOSE_PATH = os.getenv("LOG_MCP_COMPOSE_FILE", os.path.join(PROJECT_ROOT, "docker-compose.yml"))
+PROBE_HOST = os.getenv("LOG_MCP_PROBE_HOST", "127.0.0.1")
+SAUDE_TTL = float(os.getenv("LOG_MCP_HEALTH_TTL", "10"))
+_compose_cache = {"mtime": None, "servicos": []}
+_saude_cache = {"ts": 0.0, "relatorio": None}
+_saude_lock = threading.Lock()
+
 @mcp.tool()
 def ler_logs_servico(nome_servico: str, linhas: int = 20):
     """
@@ -21,17 +55,266 @@ def ler_logs_servico(nome_servico: str, linhas: int = 20):
         return f"Erro ao acessar container {nome_servico}: {e}"
 
 @mcp.tool()
-def analisar_saude_infra():
-    """Verifica se todos os bancos e o cache estão rodando."""
-    servicos = ['mssql-db', 'mongodb-store', 'redis-cache']
-    status_geral = ""
-    for s in servicos:
+def buscar_logs(nome_servico: str, padrao: str = None, nivel: str = None, desde: str = None,
+                ate: str = None, max_bytes: int = MAX_BYTES_PADRAO, max_linhas: int = 200):
+    """
+    Busca nos logs de um container, filtrando no servidor (só as linhas que batem voltam).
+    - padrao: regex aplicada a cada linha (ex.: 'Timeout|deadlock')
+    - nivel: nível mínimo ('debug', 'info', 'warn', 'error')
+    - desde/ate: ISO 8601 ('2025-01-31T14:00:00') ou relativo ('15m', '2h', '1d');
+      sem 'desde', varre só as últimas LOG_MCP_SEARCH_TAIL linhas
+    - max_bytes/max_linhas: limite da resposta; ficam as ocorrências mais recentes
+    """
+    try:
+        filtro = _montar_filtro(padrao, nivel)
+        container = client.containers.get(nome_servico)
+        janela = {"since": _parse_momento(desde)} if desde else {"tail": BUSCA_TAIL}
+        stream = container.logs(stream=True, follow=False, timestamps=True,
+                                until=_parse_momento(ate), **janela)
+        linhas, cortado = _coletar_recentes(stream, filtro, max_bytes, max_linhas)
+    except Exception as e:
+        return f"Erro ao buscar logs de {nome_servico}: {e}"
+
+    escopo = "" if desde else f" (últimas {BUSCA_TAIL} linhas do container)"
+    cabecalho = f"--- {len(linhas)} linha(s) de {nome_servico}{_descrever_filtros(padrao, nivel, desde, ate)}{escopo} ---"
+    rodape = "\n[ocorrências mais antigas omitidas no limite; refine o filtro ou o intervalo]" if cortado else ""
+    return cabecalho + "\n" + "\n".join(linhas) + rodape
+
+@mcp.tool()
+def acompanhar_logs(nome_servico: str, padrao: str = None, nivel: str = None, cursor: str = None,
+                    max_bytes: int = MAX_BYTES_PADRAO, max_linhas: int = 200, reiniciar: bool = False):
+    """
+    Acompanha os logs de forma incremental: cada chamada devolve só as linhas novas
+    desde a anterior com o mesmo filtro (o cursor fica guardado por serviço e filtro
+    e também vem na resposta): alternar filtros não pula linhas de nenhum deles.
+    Na primeira chamada (ou com reiniciar=True) começa pelos últimos 5 minutos.
+    """
+    chave = (nome_servico, padrao or None, nivel or None)
+    with _cursores_lock:
+        if reiniciar:
+            _cursores.pop(chave, None)
+        inicio = cursor or _cursores.get(chave)
+
+    try:
+        filtro = _montar_filtro(padrao, nivel)
+        container = client.containers.get(nome_servico)
+        desde = _parse_momento(inicio) if inicio else _parse_momento("5m")
+        stream = container.logs(stream=True, follow=False, timestamps=True,
+                                since=int(desde.timestamp()))
+        linhas, ultimo, cortado = _coletar(stream, filtro, max_bytes, max_linhas, depois_de=inicio)
+    except Exception as e:
+        return f"Erro ao acompanhar logs de {nome_servico}: {e}"
+
+    # Mesmo sem linhas que batem no filtro, o cursor avança para o que já foi lido
+    novo_cursor = ultimo or inicio
+    if novo_cursor:
+        with _cursores_lock:
+            _cursores[chave] = novo_cursor
+
+    cabecalho = f"--- {len(linhas)} linha(s) nova(s) de {nome_servico} | cursor: {novo_cursor or '-'} ---"
+    rodape = "\n[limite atingido; chame de novo para continuar do cursor]" if cortado else ""
+    return cabecalho + "\n" + "\n".join(linhas) + rodape
+
+@mcp.tool()
+def analisar_saude_infra(forcar: bool = False):
+    """
+    Verifica todos os serviços do docker-compose.yml em paralelo: status do container,
+    healthcheck do Docker, reinícios, CPU/memória e se a porta mapeada aceita conexão.
+    O resultado fica em cache por alguns segundos (forcar=True ignora o cache).
+    """
+    # Um único probe por vez: chamadas simultâneas esperam e reaproveitam o resultado
+    with _saude_lock:
+        idade = time.monotonic() - _saude_cache["ts"]
+        if not forcar and _saude_cache["relatorio"] and idade < SAUDE_TTL:
+            return f"{_saude_cache['relatorio']}\n(cache de {idade:.1f}s)"
+
         try:
-            container = client.containers.get(s)
-            status_geral += f"Serviço {s}: {container.status}\n"
-        except:
-            status_geral += f"Serviço {s}: NÃO ENCONTRADO\n"
-    return status_geral
+            servicos = _ler_servicos_compose()
+        except Exception as e:
+            return f"Erro ao ler {COMPOSE_PATH}: {e}"
+
+        with ThreadPoolExecutor(max_workers=max(1, len(servicos))) as pool:
+            resultados = list(pool.map(_sondar_servico, servicos))
+
+        relatorio = "\n".join(resultados)
+        _saude_cache.update(ts=time.monotonic(), relatorio=relatorio)
+        return relatorio
+
+# --- Apoio ---
+
+def _montar_filtro(padrao, nivel):
+    """Uma única regex por chamada, compilada antes de ler o stream"""
+    regex_padrao = re.compile(padrao) if padrao else None
+    regex_nivel = None
+    if nivel:
+        nivel = nivel.lower()
+        if nivel not in NIVEIS:
+            raise ValueError(f"nível inválido '{nivel}' (use {', '.join(ORDEM_NIVEIS)})")
+        palavras = [p for n in ORDEM_NIVEIS[ORDEM_NIVEIS.index(nivel):] for p in NIVEIS[n]]
+        regex_nivel = re.compile(r"\b(?:" + "|".join(palavras) + r")\b", re.IGNORECASE)
+
+    def filtro(texto):
+        if regex_nivel and not regex_nivel.search(texto):
+            return False
+        return not regex_padrao or bool(regex_padrao.search(texto))
+    return filtro
+
+def _coletar(stream, filtro, max_bytes, max_linhas, depois_de=None):
+    """
+    Lê o stream linha a linha (os blocos do Docker não respeitam quebras de linha),
+    aplica o filtro e para ao atingir o limite, fechando a conexão com o daemon.
+    Retorna (linhas, timestamp da última linha lida, cortado?).
+    """
+    linhas, total, ultimo, cortado = [], 0, None, False
+    limite_cursor = _chave_ts(depois_de) if depois_de else None
+    try:
+        for linha in _linhas(stream):
+            ts, _, texto = linha.partition(" ")
+            if limite_cursor and _chave_ts(ts) <= limite_cursor:
+                continue
+            if not filtro(texto):
+                ultimo = ts
+                continue
+            tamanho = len(linha.encode("utf-8")) + 1
+            if total + tamanho > max_bytes or len(linhas) >= max_linhas:
+                cortado = True
+                break
+            linhas.append(linha)
+            total += tamanho
+            ultimo = ts
+    finally:
+        if hasattr(stream, "close"):
+            stream.close()
+    return linhas, ultimo, cortado
+
+def _coletar_recentes(stream, filtro, max_bytes, max_linhas):
+    """
+    Lê a janela inteira (já limitada por tail/since) e guarda só as ocorrências
+    mais recentes que cabem em max_bytes/max_linhas, em ordem cronológica.
+    Retorna (linhas, alguma ocorrência mais antiga ficou de fora?).
+    """
+    linhas, total, cortado = deque(), 0, False
+    try:
+        for linha in _linhas(stream):
+            if not filtro(linha.partition(" ")[2]):
+                continue
+            linhas.append(linha)
+            total += len(linha.encode("utf-8")) + 1
+            while linhas and (len(linhas) > max_linhas or total > max_bytes):
+                total -= len(linhas.popleft().encode("utf-8")) + 1
+                cortado = True
+    finally:
+        if hasattr(stream, "close"):
+            stream.close()
+    return list(linhas), cortado
+
+def _linhas(stream):
+    resto = b""
+    for bloco in stream:
+        resto += bloco
+        *completas, resto = resto.split(b"\n")
+        for linha in completas:
+            yield linha.decode("utf-8", errors="replace").rstrip("\r")
+    if resto:
+        yield resto.decode("utf-8", errors="replace").rstrip("\r")
+
+def _chave_ts(ts):
+    """RFC3339Nano do Docker corta zeros à direita: normaliza para comparar como texto"""
+    base, _, fracao = ts.rstrip("Z").partition(".")
+    return f"{base}.{fracao.ljust(9, '0')}"
+
+def _parse_momento(valor):
+    """'15m', '2h', '1d', '30s' (relativos a agora) ou ISO 8601 -> datetime em UTC"""
+    if not valor:
+        return None
+    relativo = re.fullmatch(r"(\d+)([smhd])", valor.strip())
+    if relativo:
+        unidade = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}[relativo.group(2)]
+        return datetime.now(timezone.utc) - timedelta(**{unidade: int(relativo.group(1))})
+    # Timestamps do Docker têm nanossegundos: o datetime só aceita até micro
+    texto = re.sub(r"(\.\d{6})\d+", r"\1", valor.strip().replace("Z", "+00:00"))
+    momento = datetime.fromisoformat(texto)
+    return momento if momento.tzinfo else momento.replace(tzinfo=timezone.utc)
+
+def _ler_servicos_compose():
+    """
+    [(serviço, container_name, [portas do host])] do docker-compose.yml.
+    Leitura simples por indentação (sem dependência de YAML), refeita só se o arquivo mudar.
+    """
+    mtime = os.path.getmtime(COMPOSE_PATH)
+    if _compose_cache["mtime"] == mtime:
+        return _compose_cache["servicos"]
+
+    servicos, atual, secao = [], None, None
+    with open(COMPOSE_PATH, "r", encoding="utf-8") as f:
+        for linha in f:
+            if not linha.strip() or linha.lstrip().startswith("#"):
+                continue
+            if not linha.startswith(" "):
+                secao = linha.split(":")[0].strip()
+                continue
+            if secao != "services":
+                continue
+            chave = re.match(r"^  ([\w.-]+):\s*$", linha)
+            if chave:
+                atual = {"servico": chave.group(1), "container": chave.group(1), "portas": []}
+                servicos.append(atual)
+                continue
+            nome = re.match(r"^    container_name:\s*[\"']?([\w.-]+)", linha)
+            if atual and nome:
+                atual["container"] = nome.group(1)
+            porta = re.match(r"^      - [\"']?(?:[\d.]+:)?(\d+):\d+", linha)
+            if atual and porta:
+                atual["portas"].append(int(porta.group(1)))
+
+    resultado = [(s["servico"], s["container"], s["portas"]) for s in servicos]
+    _compose_cache.update(mtime=mtime, servicos=resultado)
+    return resultado
+
+def _sondar_servico(servico):
+    nome_servico, nome_container, portas = servico
+    portas_txt = ", ".join(f"{p} {'aberta' if _porta_aberta(p) else 'FECHADA'}" for p in portas) or "sem porta"
+    try:
+        container = client.containers.get(nome_container)
+    except Exception:
+        return f"❌ {nome_servico} ({nome_container}): NÃO ENCONTRADO | portas: {portas_txt}"
+
+    estado = container.attrs.get("State", {})
+    saude = (estado.get("Health") or {}).get("Status", "sem healthcheck")
+    reinicios = container.attrs.get("RestartCount", 0)
+    recursos = _recursos(container) if container.status == "running" else "-"
+
+    pronto = container.status == "running" and saude in ("healthy", "sem healthcheck") and "FECHADA" not in portas_txt
+    icone = "✅" if pronto else "⚠️"
+    return (f"{icone} {nome_servico} ({nome_container}): {container.status} | health: {saude} | "
+            f"reinícios: {reinicios} | {recursos} | portas: {portas_txt}")
+
+def _recursos(container):
+    """CPU (%) e memória a partir de uma amostra do docker stats"""
+    try:
+        stats = container.stats(stream=False)
+        cpu, pre = stats["cpu_stats"], stats.get("precpu_stats", {})
+        delta_cpu = cpu["cpu_usage"]["total_usage"] - pre.get("cpu_usage", {}).get("total_usage", 0)
+        delta_sis = cpu.get("system_cpu_usage", 0) - pre.get("system_cpu_usage", 0)
+        nucleos = cpu.get("online_cpus") or len(cpu["cpu_usage"].get("percpu_usage") or [1])
+        cpu_pct = (delta_cpu / delta_sis) * nucleos * 100 if delta_sis > 0 else 0.0
+        mem = stats.get("memory_stats", {})
+        usado = mem.get("usage", 0) - (mem.get("stats", {}).get("inactive_file", 0))
+        return f"cpu: {cpu_pct:.1f}% | mem: {usado / 2**20:.0f} MiB"
+    except Exception as e:
+        return f"stats indisponível ({e})"
+
+def _porta_aberta(porta, timeout=1.0):
+    try:
+        with socket.create_connection((PROBE_HOST, porta), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+def _descrever_filtros(padrao, nivel, desde, ate):
+    partes = [f"{nome}={valor}" for nome, valor in
+              (("padrao", padrao), ("nivel", nivel), ("desde", desde), ("ate", ate)) if valor]
+    return f" ({', '.join(partes)})" if partes else ""
 
 if __name__ == "__main__":
-    mcp.run()
\ No newline at end of file
+    mcp.run()